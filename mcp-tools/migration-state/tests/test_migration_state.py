@@ -27,8 +27,10 @@ from typing import Dict, Any, List
 
 # Add parent directories to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'web-automation' / 'src'))
 
 from shared.database.migration_db import MigrationDatabase
+from web_automation.icloud_client import ICloudClientWithSession
 
 class Colors:
     """Terminal colors for better test output"""
@@ -556,6 +558,23 @@ async def test_internal_functions(db: MigrationDatabase, migration_id: str) -> D
         print_test("calculate_storage_progress", False, str(e))
         test_results.append(("internal_storage_progress", False))
     
+    print("\n🌐 Test: Storage client browser after initialize_apis() only...")
+    # get_migration_status builds the iCloud client and calls only initialize_apis();
+    # the storage check must still be able to get a browser from it
+    client = ICloudClientWithSession()
+    try:
+        await client.initialize_apis()
+        browser = await client._get_browser()
+        connected = browser.is_connected()
+        print_test("initialize_apis browser", connected,
+                  "Shared browser launched" if connected else "Browser not connected")
+        test_results.append(("internal_storage_browser", connected))
+    except Exception as e:
+        print_test("initialize_apis browser", False, str(e))
+        test_results.append(("internal_storage_browser", False))
+    finally:
+        await client.cleanup()
+    
     return {"internal": test_results}
 
 async def main():
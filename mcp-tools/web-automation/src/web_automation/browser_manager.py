@@ -11,10 +11,54 @@ import logging
 import asyncio
 from typing import Dict, Optional, Any, List
 from pathlib import Path
-from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
 
 logger = logging.getLogger(__name__)
 
+# Cap on page navigations (Playwright's default is 30s)
+NAVIGATION_TIMEOUT_MS = 15000
+
+
+async def safe_goto(page: Page, url: str, wait_until: str = "domcontentloaded"):
+    """Navigate to url without waiting for the network to go idle.
+    
+    Apple and Google pages keep background requests running, so networkidle
+    is slow and flaky. Callers that need a specific element should
+    wait_for_selector it rather than wait for global idle.
+    """
+    return await page.goto(url, wait_until=wait_until, timeout=NAVIGATION_TIMEOUT_MS)
+
+
+# One Playwright driver per process, shared by every client that needs it.
+# Separate async_playwright().start() calls each spawn their own driver
+# subprocess; the reference count stops it once the last user releases it.
+_playwright: Optional[Playwright] = None
+_playwright_users = 0
+_playwright_lock = asyncio.Lock()
+
+
+async def get_playwright() -> Playwright:
+    """Return the shared Playwright instance, starting it on first use.
+    
+    Every call must be paired with release_playwright().
+    """
+    global _playwright, _playwright_users
+    async with _playwright_lock:
+        if _playwright is None:
+            _playwright = await async_playwright().start()
+        _playwright_users += 1
+        return _playwright
+
+
+async def release_playwright():
+    """Drop one reference to the shared Playwright, stopping it after the last."""
+    global _playwright, _playwright_users
+    async with _playwright_lock:
+        _playwright_users = max(0, _playwright_users - 1)
+        if _playwright_users == 0 and _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
+
 class BrowserManager:
     """
     Manages browser connections and tab reuse for demo mode.
@@ -53,7 +97,7 @@ class BrowserManager:
     async def ensure_playwright(self):
         """Ensure playwright is started."""
         if not self._playwright:
-            self._playwright = await async_playwright().start()
+            self._playwright = await get_playwright()
         return self._playwright
     
     async def check_browser_cdp(self) -> bool:
@@ -190,7 +234,7 @@ class BrowserManager:
                 # Navigate to new URL if provided
                 if url and page.url != url:
                     logger.info(f"Navigating {service_name} tab to {url}")
-                    await page.goto(url, wait_until="networkidle")
+                    await safe_goto(page, url)
                     await page.wait_for_timeout(1000)
                 
                 return page
@@ -214,7 +258,7 @@ class BrowserManager:
             # Navigate to URL if provided
             if url:
                 logger.info(f"Creating new tab for {service_name} at {url}")
-                await page.goto(url, wait_until="networkidle")
+                await safe_goto(page, url)
                 await page.wait_for_timeout(1000)
             else:
                 logger.info(f"Created new tab for {service_name}")
@@ -266,7 +310,7 @@ class BrowserManager:
         
         # Stop playwright
         if self._playwright:
-            await self._playwright.stop()
+            await release_playwright()
             self._playwright = None
     
     @classmethod
@@ -10,11 +10,12 @@ import logging
 import json
 import re
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
-from playwright.async_api import async_playwright, Browser, Page, BrowserContext
+from playwright.async_api import Browser, Page, BrowserContext
 from .logging_config import setup_logging, get_screenshot_dir
+from .browser_manager import safe_goto, get_playwright, release_playwright, NAVIGATION_TIMEOUT_MS
 
 # Try to import playwright-stealth for better success rate
 try:
@@ -25,6 +26,17 @@ except ImportError:
 
 logger = setup_logging(__name__)
 
+# The storage page's numbers are plain text; these resources only cost bandwidth
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+
+async def _block_heavy_resources(route):
+    """Abort image/media/font requests and let everything else through."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 class GoogleStorageClient:
     """Google One Storage client for monitoring storage during migration.
     
@@ -54,15 +66,22 @@ class GoogleStorageClient:
         session_dir (Path): Directory for storing browser session state
         playwright: Playwright instance for browser automation
         browser: Chrome browser instance
-        context: Browser context with saved session
+        context: Browser context with saved session (one per metrics call)
         page: Current page being automated
+        browser_factory: Optional coroutine returning a shared browser. When set,
+            each call opens a new context on that browser instead of launching one.
     """
     
-    def __init__(self, session_dir: Optional[str] = None):
+    def __init__(self, session_dir: Optional[str] = None,
+                 browser_factory: Optional[Callable[[], Awaitable[Browser]]] = None):
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.browser_factory = browser_factory
+        self._headless: Optional[bool] = None
+        # Parsed session_state.json, kept with the file mtime it was read at
+        self._storage_state: Optional[Tuple[int, Dict[str, Any]]] = None
         
         # Share the same session directory as GoogleDashboardClient
         if session_dir:
@@ -80,7 +99,40 @@ class GoogleStorageClient:
     
     async def initialize(self):
         """Initialize Playwright"""
-        self.playwright = await async_playwright().start()
+        if not self.playwright:
+            self.playwright = await get_playwright()
+    
+    async def _get_browser(self, headless: bool) -> Browser:
+        """Return a browser for a metrics call, reusing one whenever possible.
+        
+        A shared (headed) browser from browser_factory is preferred; otherwise
+        the browser this client launched earlier is reused if it is still
+        connected and matches the requested headless mode.
+        """
+        if self.browser_factory and not headless:
+            return await self.browser_factory()
+        
+        if self.browser and self.browser.is_connected() and self._headless == headless:
+            return self.browser
+        
+        if self.browser:
+            await self.browser.close()
+        self.browser = await self.playwright.chromium.launch(
+            headless=headless,
+            args=['--disable-blink-features=AutomationControlled']
+        )
+        self._headless = headless
+        return self.browser
+    
+    async def _close_context(self):
+        """Close the context left over from the previous metrics call"""
+        if self.context:
+            try:
+                await self.context.close()
+            except Exception as e:
+                logger.debug(f"Previous context already closed: {e}")
+            self.context = None
+            self.page = None
     
     def is_session_valid(self) -> bool:
         """Check if saved session exists and is recent (7 days like iCloud)"""
@@ -113,6 +165,7 @@ class GoogleStorageClient:
             state = await self.context.storage_state()
             with open(self.session_file, 'w') as f:
                 json.dump(state, f)
+            self._storage_state = (self.session_file.stat().st_mtime_ns, state)
             
             # Save session metadata
             info = {
@@ -130,6 +183,7 @@ class GoogleStorageClient:
     async def clear_session(self):
         """Clear saved session"""
         try:
+            self._storage_state = None
             if self.session_file.exists():
                 self.session_file.unlink()
             if self.session_info_file.exists():
@@ -138,6 +192,14 @@ class GoogleStorageClient:
         except Exception as e:
             logger.error(f"Error clearing session: {e}")
     
+    def _load_storage_state(self) -> Dict[str, Any]:
+        """Return the saved session state, re-reading the file only when it changes"""
+        mtime = self.session_file.stat().st_mtime_ns
+        if not self._storage_state or self._storage_state[0] != mtime:
+            with open(self.session_file, 'r') as f:
+                self._storage_state = (mtime, json.load(f))
+        return self._storage_state[1]
+    
     def parse_storage_value(self, text: str) -> float:
         """Parse storage value from text like '13.88 GB' or '2 TB'"""
         try:
@@ -235,16 +297,14 @@ class GoogleStorageClient:
             else:
                 headless = False  # Always show browser in non-demo mode for debugging
             
-            self.browser = await self.playwright.chromium.launch(
-                headless=headless,
-                args=['--disable-blink-features=AutomationControlled']
-            )
+            # Reuse the browser and give this call its own context
+            browser = await self._get_browser(headless)
+            await self._close_context()
             
             if use_saved_session:
                 logger.info("Using saved Google session")
-                # Load the session state
-                with open(self.session_file, 'r') as f:
-                    storage_state = json.load(f)
+                # Load the session state (parsed once per change to the file)
+                storage_state = self._load_storage_state()
                 
                 # Count cookies for debugging
                 cookies = storage_state.get('cookies', [])
@@ -252,17 +312,21 @@ class GoogleStorageClient:
                 logger.info(f"Loaded {len(google_cookies)} Google cookies from saved session")
                 
                 # Create context with saved state
-                self.context = await self.browser.new_context(
+                self.context = await browser.new_context(
                     storage_state=storage_state,
                     viewport={"width": 1920, "height": 1080}
                 )
+                # A saved session never shows the sign-in flow here (an expired one
+                # returns an error), so the page only needs its text to load
+                await self.context.route("**/*", _block_heavy_resources)
             else:
                 logger.info("Creating new Google browser context")
                 # Create new context
-                self.context = await self.browser.new_context(
+                self.context = await browser.new_context(
                     viewport={"width": 1920, "height": 1080}
                 )
             
+            self.context.set_default_navigation_timeout(NAVIGATION_TIMEOUT_MS)
             self.page = await self.context.new_page()
             
             # Apply stealth if available
@@ -271,7 +335,7 @@ class GoogleStorageClient:
             
             # Navigate to Google One Storage
             logger.info("Navigating to Google One Storage...")
-            await self.page.goto("https://one.google.com/storage", wait_until="networkidle")
+            await safe_goto(self.page, "https://one.google.com/storage")
             await self.page.wait_for_timeout(3000)
             
             current_url = self.page.url
@@ -503,7 +567,7 @@ class GoogleStorageClient:
                 # Update result with found service data
                 if service_data:
                     result.update(service_data)
-                    logger.info(f"Service breakdown found: {service_data}")
+                    logger.info("Service breakdown found: %s", service_data)
                 else:
                     logger.warning("Could not extract service breakdown")
                 
@@ -531,15 +595,17 @@ class GoogleStorageClient:
             }
         finally:
             # Don't close browser - keep it open for reuse
-            # Browser will be closed in cleanup() method when done
+            # Context is replaced on the next call, browser closed in cleanup()
             pass
     
     async def cleanup(self):
-        """Clean up browser resources"""
+        """Clean up browser resources (a shared browser is left to its owner)"""
+        await self._close_context()
         if self.browser:
             await self.browser.close()
         if self.playwright:
-            await self.playwright.stop()
+            await release_playwright()
+            self.playwright = None
 
 
 # For backwards compatibility with existing code
@@ -13,14 +13,14 @@ import os
 import sys
 import json
 import uuid
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
-from playwright.async_api import async_playwright, Browser, Page, Frame
+from playwright.async_api import Browser, BrowserContext, Page, Frame
 
 # Import our Google Storage client and browser manager
 from .google_storage_client import GoogleStorageClient
-from .browser_manager import BrowserManager
+from .browser_manager import BrowserManager, safe_goto, get_playwright, release_playwright, NAVIGATION_TIMEOUT_MS
 
 # Import shared database components
 sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent))
@@ -32,6 +32,17 @@ except ImportError:
 
 logger = setup_logging(__name__)
 
+# Opt-in remote debugging port for the Chromium instance this client launches.
+# When set, the endpoint is saved to the session directory so a later server
+# process can attach to the same browser via CDP instead of launching its own.
+# Off by default: the browser is logged into Apple ID and Google, and an open
+# debugging port lets any local process drive it.
+CDP_PORT = int(os.getenv("ICLOUD_CDP_PORT") or 0)
+BROWSER_ARGS = ['--disable-blink-features=AutomationControlled']
+
+# Upper bound on waiting for the Google baseline once the Apple flow is done
+BASELINE_TIMEOUT_SECONDS = 120
+
 class ICloudClientWithSession:
     """iCloud client with persistent session management for photo migration.
     
@@ -62,6 +73,7 @@ class ICloudClientWithSession:
     def __init__(self, session_dir: Optional[str] = None):
         self.playwright = None
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         
         # Session storage directory
@@ -74,6 +86,12 @@ class ICloudClientWithSession:
         self.session_dir.mkdir(exist_ok=True)
         self.session_file = self.session_dir / "browser_state.json"
         self.session_info_file = self.session_dir / "session_info.json"
+        self.cdp_file = self.session_dir / "cdp.json"
+        self._owns_browser = False
+        self._owns_context = False
+        self._browser_lock = asyncio.Lock()
+        # Parsed browser_state.json, kept with the file mtime it was read at
+        self._storage_state: Optional[Tuple[int, Dict[str, Any]]] = None
         
         # Initialize new components for Phase 3
         self.google_storage_client = None
@@ -84,30 +102,131 @@ class ICloudClientWithSession:
         
         logger.info(f"Session directory: {self.session_dir}")
     
-    async def initialize(self):
-        """Initialize Playwright"""
-        self.playwright = await async_playwright().start()
+    async def initialize(self, browser: Optional[Browser] = None):
+        """Initialize Playwright, optionally adopting an already connected browser"""
+        if not self.playwright:
+            self.playwright = await get_playwright()
+        if browser:
+            self.browser = browser
+    
+    async def _get_browser(self) -> Browser:
+        """Return the shared Chromium instance, launching one only when needed.
+        
+        Preference order:
+        1. The browser this client already holds, if still connected
+        2. With ICLOUD_CDP_PORT set, a browser whose CDP endpoint is saved in cdp.json
+        3. A fresh launch (with remote debugging only when ICLOUD_CDP_PORT is set)
+        """
+        async with self._browser_lock:
+            return await self._connect_or_launch_browser()
+    
+    async def _connect_or_launch_browser(self) -> Browser:
+        """Body of _get_browser, run under the lock so concurrent callers share one launch"""
+        if self.browser and self.browser.is_connected():
+            return self.browser
+        
+        # Callers that only ran initialize_apis() (e.g. the migration-state
+        # server) reach here through the storage client's browser_factory
+        if not self.playwright:
+            await self.initialize()
+        
+        endpoint = self._load_cdp_endpoint() if CDP_PORT else None
+        if endpoint:
+            try:
+                self.browser = await self.playwright.chromium.connect_over_cdp(endpoint)
+                self._owns_browser = False
+                logger.info(f"Reusing existing browser via CDP at {endpoint}")
+                return self.browser
+            except Exception as e:
+                logger.info(f"Saved CDP endpoint {endpoint} not reachable: {e}")
+                self.cdp_file.unlink(missing_ok=True)
+        
+        logger.info("Launching shared browser...")
+        args = BROWSER_ARGS + [f'--remote-debugging-port={CDP_PORT}'] if CDP_PORT else BROWSER_ARGS
+        self.browser = await self.playwright.chromium.launch(headless=False, args=args)
+        self._owns_browser = True
+        if CDP_PORT:
+            self._save_cdp_endpoint(f"http://localhost:{CDP_PORT}")
+        return self.browser
+    
+    async def _new_context(self, **kwargs) -> BrowserContext:
+        """Open a fresh context on the shared browser for this tool call.
+        
+        The context left by the previous call is closed first, so each call
+        gets its own cookies/storage while sharing the Chromium process.
+        """
+        browser = await self._get_browser()
+        if self.context and self._owns_context:
+            try:
+                await self.context.close()
+            except Exception as e:
+                logger.debug(f"Previous context already closed: {e}")
+        self._owns_context = True
+        self.context = await browser.new_context(
+            viewport={"width": 1920, "height": 1080},
+            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+            **kwargs
+        )
+        self.context.set_default_navigation_timeout(NAVIGATION_TIMEOUT_MS)
+        return self.context
+    
+    def _load_cdp_endpoint(self) -> Optional[str]:
+        """Read the CDP endpoint saved by a previous launch, if any"""
+        if not self.cdp_file.exists():
+            return None
+        try:
+            with open(self.cdp_file, 'r') as f:
+                return json.load(f).get('endpoint')
+        except Exception as e:
+            logger.warning("Could not read CDP endpoint: %s", e)
+            return None
+    
+    def _save_cdp_endpoint(self, endpoint: str):
+        """Persist the CDP endpoint so later tool calls can reconnect"""
+        try:
+            with open(self.cdp_file, 'w') as f:
+                json.dump({'endpoint': endpoint, 'saved_at': datetime.now().isoformat()}, f, indent=2)
+        except Exception as e:
+            logger.warning("Could not save CDP endpoint: %s", e)
     
     async def initialize_apis(self):
         """Initialize Google APIs and database connections"""
+        previous_client = self.google_storage_client
+        
         # Initialize Google Dashboard client
         google_session_dir = os.path.expanduser("~/.google_session")
-        self.google_storage_client = GoogleStorageClient(session_dir=google_session_dir)
-        await self.google_storage_client.initialize()
+        self.google_storage_client = GoogleStorageClient(
+            session_dir=google_session_dir,
+            browser_factory=self._get_browser
+        )
         
-        # Initialize database if available
-        if MigrationDatabase:
-            try:
-                self.db = MigrationDatabase()
-                # Initialize schemas on first use
-                await self.db.initialize_schemas()
-                logger.info("Database initialized successfully")
-            except Exception as e:
-                logger.warning(f"Database initialization failed: {e}")
-                self.db = None
+        # Playwright startup and schema setup are independent, so overlap them
+        await asyncio.gather(
+            self.google_storage_client.initialize(),
+            self._initialize_database()
+        )
+        
+        # A replaced client still holds a reference on the shared Playwright
+        # driver; release it (after the new client took its own) or the driver
+        # never stops
+        if previous_client:
+            await previous_client.cleanup()
         
         logger.info("APIs initialized")
     
+    async def _initialize_database(self):
+        """Initialize the migration database if available"""
+        if not MigrationDatabase:
+            return
+        try:
+            self.db = MigrationDatabase()
+            # Initialize schemas on first use
+            await self.db.initialize_schemas()
+            logger.info("Database initialized successfully")
+        except Exception as e:
+            logger.warning("Database initialization failed: %s", e)
+            self.db = None
+    
     def is_session_valid(self) -> bool:
         """Check if saved session exists and is recent"""
         if not self.session_file.exists() or not self.session_info_file.exists():
@@ -129,7 +248,7 @@ class ICloudClientWithSession:
             return True
             
         except Exception as e:
-            logger.error(f"Error checking session: {e}")
+            logger.error("Error checking session: %s", e)
             return False
     
     async def save_session(self):
@@ -142,7 +261,8 @@ class ICloudClientWithSession:
                 context = self.browser.contexts[0]
             
             # Save FULL storage state including cookies, localStorage, sessionStorage
-            await context.storage_state(path=str(self.session_file))
+            state = await context.storage_state(path=str(self.session_file))
+            self._storage_state = (self.session_file.stat().st_mtime_ns, state)
             
             # Also save current page URL for verification
             info = {
@@ -155,14 +275,20 @@ class ICloudClientWithSession:
                 json.dump(info, f, indent=2)
             
             # Log what we saved
-            with open(self.session_file, 'r') as f:
-                state = json.load(f)
-                cookie_count = len(state.get('cookies', []))
-                origin_count = len(state.get('origins', []))
-                logger.info(f"Session saved: {cookie_count} cookies, {origin_count} origins")
+            cookie_count = len(state.get('cookies', []))
+            origin_count = len(state.get('origins', []))
+            logger.info(f"Session saved: {cookie_count} cookies, {origin_count} origins")
             
         except Exception as e:
-            logger.error(f"Failed to save session: {e}")
+            logger.error("Failed to save session: %s", e)
+    
+    def _load_storage_state(self) -> Dict[str, Any]:
+        """Return the saved browser state, re-reading the file only when it changes"""
+        mtime = self.session_file.stat().st_mtime_ns
+        if not self._storage_state or self._storage_state[0] != mtime:
+            with open(self.session_file, 'r') as f:
+                self._storage_state = (mtime, json.load(f))
+        return self._storage_state[1]
     
     async def get_photo_status(self, apple_id: Optional[str] = None, 
                                password: Optional[str] = None,
@@ -244,6 +370,7 @@ class ICloudClientWithSession:
                         "https://privacy.apple.com"
                     )
                     self.context = self.page.context
+                    self._owns_context = False
                     logger.info("Using existing browser tab for iCloud operations")
                 else:
                     # CDP connection failed - user needs to launch browser
@@ -251,49 +378,24 @@ class ICloudClientWithSession:
                     logger.info("Please ensure Chromium is running with: --remote-debugging-port=9222")
                     # Fallback to normal browser launch
                     logger.info("Falling back to normal browser launch...")
-                    self.browser = await self.playwright.chromium.launch(
-                        headless=False,
-                        args=['--disable-blink-features=AutomationControlled']
-                    )
-                    self.context = await self.browser.new_context(
-                        viewport={"width": 1920, "height": 1080},
-                        user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-                    )
+                    await self._new_context()
                     self.page = await self.context.new_page()
             else:
-                # Normal mode: launch new browser
+                # Normal mode: shared browser, launched on first use
                 if use_saved_session:
                     logger.info("Using saved session to avoid 2FA...")
-                    # Launch browser with saved state
-                    self.browser = await self.playwright.chromium.launch(
-                        headless=False,
-                        args=['--disable-blink-features=AutomationControlled']
-                    )
-                    
-                    # Load saved session
-                    self.context = await self.browser.new_context(
-                        storage_state=str(self.session_file),
-                        viewport={"width": 1920, "height": 1080},
-                        user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-                    )
+                    # New context on the shared browser, loaded with saved session
+                    await self._new_context(storage_state=self._load_storage_state())
                 else:
                     logger.info("Starting fresh login...")
-                    # Launch browser without saved state
-                    self.browser = await self.playwright.chromium.launch(
-                        headless=False,
-                        args=['--disable-blink-features=AutomationControlled']
-                    )
-                    
-                    self.context = await self.browser.new_context(
-                        viewport={"width": 1920, "height": 1080},
-                        user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-                    )
+                    # New context on the shared browser without saved state
+                    await self._new_context()
                 
                 self.page = await self.context.new_page()
             
             # Navigate to privacy.apple.com
             logger.info("Navigating to privacy.apple.com...")
-            await self.page.goto("https://privacy.apple.com", wait_until="networkidle")
+            await safe_goto(self.page, "https://privacy.apple.com")
             await self.page.wait_for_timeout(3000)
             
             current_url = self.page.url
@@ -604,10 +706,12 @@ class ICloudClientWithSession:
                 for element in all_text_elements:
                     try:
                         text = await element.inner_text()
-                        # Log any text containing numbers and photos/videos
-                        if 'photo' in text.lower() or 'video' in text.lower():
-                            if re.search(r'\d+', text):
-                                logger.debug(f"Found text with numbers: {text[:100]}")
+                        # Log any text containing numbers and photos/videos (debug only,
+                        # so the per-element lowercasing and regex are skipped otherwise)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            lowered = text.lower()
+                            if ('photo' in lowered or 'video' in lowered) and re.search(r'\d+', text):
+                                logger.debug("Found text with numbers: %s", text[:100])
                         
                         match = re.search(r'([\d,]+)\s+photos\s+and\s+([\d,]+)\s+videos', text)
                         if match:
@@ -662,7 +766,7 @@ class ICloudClientWithSession:
                 }
                 
         except Exception as e:
-            logger.error(f"Failed: {e}")
+            logger.error("Failed: %s", e)
             raise
         finally:
             # Don't close browser here - keep it alive for transfer workflow
@@ -671,13 +775,14 @@ class ICloudClientWithSession:
     async def clear_session(self):
         """Clear saved session to force fresh login next time"""
         try:
+            self._storage_state = None
             if self.session_file.exists():
                 self.session_file.unlink()
             if self.session_info_file.exists():
                 self.session_info_file.unlink()
             logger.info("Session cleared")
         except Exception as e:
-            logger.error(f"Failed to clear session: {e}")
+            logger.error("Failed to clear session: %s", e)
     
     # ==================== NEW PHASE 3 METHODS ====================
     
@@ -685,7 +790,7 @@ class ICloudClientWithSession:
         """Initiate iCloud to Google Photos transfer workflow with video support.
         
         This is the main entry point for starting a media migration. It performs:
-        1. Establishes Google Photos baseline (current photo count)
+        1. Establishes Google Photos baseline (concurrently with steps 2-4)
         2. Authenticates with Apple ID (reusing session if available)
         3. Gets current iCloud photo/video counts
         4. Navigates through Apple's 8-step transfer workflow
@@ -770,78 +875,45 @@ class ICloudClientWithSession:
                 await self.initialize_apis()
             
             # Step 1: Establish Google One storage baseline in a NEW browser context (won't break flow)
+            # It doesn't depend on the Apple flow, so it runs while steps 2-3 proceed
             logger.info("Establishing Google One storage baseline in separate context...")
-            baseline_data = await self._establish_baseline_in_new_context()
+            baseline_task = asyncio.create_task(self._establish_baseline_in_new_context())
+            
+            try:
+                # Step 2: Get current iCloud status (or reuse existing session)
+                icloud_status = await self._fetch_source_counts(apple_id, apple_password, reuse_session)
+                
+                if icloud_status.get("status") == "error":
+                    return icloud_status
+                
+                # Step 3: Navigate to transfer initiation
+                logger.info("Initiating transfer workflow...")
+                transfer_result = await self._initiate_transfer_workflow(confirm_transfer)
+                
+                if transfer_result.get("status") == "error":
+                    return transfer_result
+                
+                try:
+                    baseline_data = await asyncio.wait_for(baseline_task, timeout=BASELINE_TIMEOUT_SECONDS)
+                except asyncio.TimeoutError:
+                    logger.warning("Storage baseline timed out - continuing with minimal baseline")
+                    baseline_data = {
+                        "status": "success",
+                        "google_photos_baseline_gb": 0.0,
+                        "total_storage_gb": 2048.0,
+                        "timestamp": datetime.now().isoformat(),
+                        "error": "Storage baseline timed out"
+                    }
+            finally:
+                # Don't leave the baseline browser context running after an early return
+                if not baseline_task.done():
+                    baseline_task.cancel()
             
             # Extract the baseline storage for Google Photos
             google_photos_baseline_gb = baseline_data.get("google_photos_baseline_gb", 0.0)
             total_storage_gb = baseline_data.get("total_storage_gb", 2048.0)
             available_storage_gb = baseline_data.get("available_storage_gb", total_storage_gb)
             
-            # Step 2: Get current iCloud status (or reuse existing session)
-            # Check if we already have an open browser with iCloud data
-            if hasattr(self, 'page') and self.page and self.browser:
-                logger.info("Reusing existing browser session...")
-                # Extract counts from current page if available
-                try:
-                    current_url = self.page.url
-                    if "privacy.apple.com" in current_url:
-                        # We're already on the right page, extract counts
-                        page_content = await self.page.content()
-                        import re
-                        photo_match = re.search(r'([\d,]+)\s+photos', page_content)
-                        video_match = re.search(r'([\d,]+)\s+videos', page_content)
-                        
-                        if photo_match and video_match:
-                            icloud_status = {
-                                "status": "success",
-                                "photos": int(photo_match.group(1).replace(',', '')),
-                                "videos": int(video_match.group(1).replace(',', '')),
-                                "storage_gb": 383,  # Default value
-                                "session_reused": True
-                            }
-                            logger.info(f"Extracted counts from existing page: {icloud_status['photos']} photos, {icloud_status['videos']} videos")
-                        else:
-                            # Fallback to calling get_photo_status
-                            logger.info("Could not extract counts from current page, calling get_photo_status...")
-                            icloud_status = await self.get_photo_status(
-                                apple_id=apple_id,
-                                password=apple_password,
-                                force_fresh_login=False
-                            )
-                    else:
-                        # Not on the right page, need to navigate
-                        logger.info("Not on privacy.apple.com, calling get_photo_status...")
-                        icloud_status = await self.get_photo_status(
-                            apple_id=apple_id,
-                            password=apple_password,
-                            force_fresh_login=False
-                        )
-                except Exception as e:
-                    logger.warning(f"Could not reuse session: {e}")
-                    icloud_status = await self.get_photo_status(
-                        apple_id=apple_id,
-                        password=apple_password,
-                        force_fresh_login=not reuse_session
-                    )
-            else:
-                logger.info("No existing browser session, getting iCloud photo status...")
-                icloud_status = await self.get_photo_status(
-                    apple_id=apple_id,
-                    password=apple_password,
-                    force_fresh_login=not reuse_session
-                )
-            
-            if icloud_status.get("status") == "error":
-                return icloud_status
-            
-            # Step 3: Navigate to transfer initiation
-            logger.info("Initiating transfer workflow...")
-            transfer_result = await self._initiate_transfer_workflow(confirm_transfer)
-            
-            if transfer_result.get("status") == "error":
-                return transfer_result
-            
             # Step 4: Generate transfer ID and save
             transfer_id = f"TRF-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
             
@@ -888,7 +960,7 @@ class ICloudClientWithSession:
             }
             
         except Exception as e:
-            logger.error(f"Transfer initiation failed: {e}")
+            logger.error("Transfer initiation failed: %s", e)
             return {
                 "status": "failed",
                 "error": str(e)
@@ -960,7 +1032,7 @@ class ICloudClientWithSession:
             if not self.google_storage_client:
                 await self.initialize_apis()
             
-            # Get transfer details
+            # Look the transfer up first so an unknown ID doesn't cost a browser scrape
             transfer = await self._get_transfer(transfer_id)
             if not transfer:
                 return {
@@ -1000,7 +1072,7 @@ class ICloudClientWithSession:
                         if result:
                             migration_id = result[0]
                 except Exception as e:
-                    logger.warning(f"Could not get migration_id from DB: {e}")
+                    logger.warning("Could not get migration_id from DB: %s", e)
             
             if not migration_id:
                 # Fallback to transfer's migration_id if available
@@ -1039,69 +1111,15 @@ class ICloudClientWithSession:
             estimates = progress_result.get('estimates', {})
             progress_info = progress_result.get('progress', {})
             
-            # Save storage snapshot to database
+            # Save storage snapshot to database before responding so the
+            # migration-state server sees it; a worker thread keeps the
+            # blocking DuckDB calls off the event loop
+            snapshot_saved = False
             if self.db and migration_id:
-                try:
-                    with self.db.get_connection() as conn:
-                        # Save snapshot (allows multiple snapshots per day for tracking)
-                        conn.execute("""
-                            INSERT INTO storage_snapshots (
-                                migration_id, day_number, snapshot_time,
-                                google_photos_gb, google_drive_gb, gmail_gb,
-                                device_backup_gb, total_used_gb,
-                                storage_growth_gb, estimated_photos_transferred, estimated_videos_transferred,
-                                percent_complete
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            migration_id, day_number, datetime.now(),
-                            current_google_photos_gb,
-                            storage_result.get('google_drive_gb', 0),
-                            storage_result.get('gmail_gb', 0),
-                            storage_result.get('device_backup_gb', 0),
-                            storage_result.get('used_storage_gb', 0),
-                            storage_info.get('growth_gb', 0),
-                            estimates.get('photos_transferred', 0),
-                            estimates.get('videos_transferred', 0),
-                            progress_info.get('percent_complete', 0)
-                        ))
-                        
-                        # Get current family adoption counts before inserting daily progress
-                        family_stats = conn.execute("""
-                            SELECT 
-                                COUNT(DISTINCT CASE WHEN faa.app_name = 'WhatsApp' AND faa.whatsapp_in_group = TRUE THEN fm.id END) as whatsapp_connected,
-                                COUNT(DISTINCT CASE WHEN faa.app_name = 'Google Maps' AND faa.location_sharing_received = TRUE THEN fm.id END) as maps_sharing,
-                                COUNT(DISTINCT CASE WHEN faa.app_name = 'Venmo' AND faa.status = 'configured' THEN fm.id END) as venmo_active
-                            FROM family_members fm
-                            LEFT JOIN family_app_adoption faa ON fm.id = faa.family_member_id
-                            WHERE fm.migration_id = ?
-                        """, (migration_id,)).fetchone()
-                        
-                        whatsapp_count = family_stats[0] if family_stats else 0
-                        maps_count = family_stats[1] if family_stats else 0
-                        venmo_count = family_stats[2] if family_stats else 0
-                        
-                        # Insert daily progress with family counts (allows multiple updates per day)
-                        conn.execute("""
-                            INSERT INTO daily_progress (
-                                migration_id, day_number, date,
-                                photos_transferred, videos_transferred,
-                                size_transferred_gb, storage_percent_complete,
-                                whatsapp_members_connected, maps_members_sharing,
-                                venmo_members_active, key_milestone
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            migration_id, day_number, datetime.now().date(),
-                            estimates.get('photos_transferred', 0),
-                            estimates.get('videos_transferred', 0),
-                            storage_info.get('growth_gb', 0),
-                            progress_info.get('percent_complete', 0),
-                            whatsapp_count, maps_count, venmo_count,
-                            progress_result.get('message', '')
-                        ))
-                        
-                        logger.info(f"Saved snapshot and progress for day {day_number}")
-                except Exception as e:
-                    logger.warning(f"Could not save to database: {e}")
+                snapshot_saved = await asyncio.to_thread(
+                    self._save_progress_snapshot,
+                    migration_id, day_number, storage_result, progress_result
+                )
             
             # Build response using shared calculation results
             return {
@@ -1113,11 +1131,11 @@ class ICloudClientWithSession:
                 "progress": progress_info,
                 "message": progress_result.get('message', ''),
                 "success": progress_result.get('success', False),
-                "snapshot_saved": bool(self.db and migration_id)
+                "snapshot_saved": snapshot_saved
             }
             
         except Exception as e:
-            logger.error(f"Progress check failed: {e}")
+            logger.error("Progress check failed: %s", e)
             return {
                 "transfer_id": transfer_id,
                 "status": "error",
@@ -1202,8 +1220,13 @@ class ICloudClientWithSession:
             if final_progress.get("status") == "error":
                 return final_progress
             
+            # Resolve the sections once instead of a chained .get() per field
+            source_counts = final_progress.get('source_counts') or {}
+            estimates = final_progress.get('estimates') or {}
+            percent_complete = final_progress['progress']['percent_complete']
+            
             # Generate completion assessment
-            is_complete = final_progress['progress']['percent_complete'] >= 99
+            is_complete = percent_complete >= 99
             
             # Update transfer status if complete
             if is_complete:
@@ -1214,23 +1237,23 @@ class ICloudClientWithSession:
                 "status": "complete" if is_complete else "incomplete",
                 "completed_at": datetime.now().isoformat() if is_complete else None,
                 "verification": {
-                    "source_photos": final_progress.get('source_counts', {}).get('photos', 0),
-                    "source_videos": final_progress.get('source_counts', {}).get('videos', 0),
-                    "estimated_photos": final_progress.get('estimates', {}).get('photos_transferred', 0),
-                    "estimated_videos": final_progress.get('estimates', {}).get('videos_transferred', 0),
-                    "match_rate": final_progress.get('progress', {}).get('percent_complete', 0)
+                    "source_photos": source_counts.get('photos', 0),
+                    "source_videos": source_counts.get('videos', 0),
+                    "estimated_photos": estimates.get('photos_transferred', 0),
+                    "estimated_videos": estimates.get('videos_transferred', 0),
+                    "match_rate": percent_complete
                 },
                 "important_photos_check": important_photos if important_photos else [],
                 "certificate": {
                     "grade": "A+" if is_complete else "Incomplete",
-                    "score": int(final_progress['progress']['percent_complete']),
+                    "score": int(percent_complete),
                     "message": "Perfect Migration - Zero Data Loss" if is_complete else "Transfer in progress",
                     "issued_at": datetime.now().isoformat()
                 }
             }
             
         except Exception as e:
-            logger.error(f"Transfer verification failed: {e}")
+            logger.error("Transfer verification failed: %s", e)
             return {
                 "transfer_id": transfer_id,
                 "status": "error",
@@ -1298,7 +1321,7 @@ class ICloudClientWithSession:
             }
             
         except Exception as e:
-            logger.error(f"Failed to confirm transfer: {e}")
+            logger.error("Failed to confirm transfer: %s", e)
             return {
                 "status": "error",
                 "message": f"Failed to confirm transfer: {str(e)}"
@@ -1306,22 +1329,81 @@ class ICloudClientWithSession:
     
     # ==================== HELPER METHODS ====================
     
+    async def _fetch_source_counts(self, apple_id: str, apple_password: str,
+                                   reuse_session: bool = True) -> Dict[str, Any]:
+        """Get iCloud photo/video counts, reusing an open privacy.apple.com page if possible"""
+        # Check if we already have an open browser with iCloud data
+        if hasattr(self, 'page') and self.page and self.browser:
+            logger.info("Reusing existing browser session...")
+            # Extract counts from current page if available
+            try:
+                current_url = self.page.url
+                if "privacy.apple.com" in current_url:
+                    # We're already on the right page, extract counts
+                    page_content = await self.page.content()
+                    import re
+                    photo_match = re.search(r'([\d,]+)\s+photos', page_content)
+                    video_match = re.search(r'([\d,]+)\s+videos', page_content)
+                    
+                    if photo_match and video_match:
+                        icloud_status = {
+                            "status": "success",
+                            "photos": int(photo_match.group(1).replace(',', '')),
+                            "videos": int(video_match.group(1).replace(',', '')),
+                            "storage_gb": 383,  # Default value
+                            "session_reused": True
+                        }
+                        logger.info(f"Extracted counts from existing page: {icloud_status['photos']} photos, {icloud_status['videos']} videos")
+                    else:
+                        # Fallback to calling get_photo_status
+                        logger.info("Could not extract counts from current page, calling get_photo_status...")
+                        icloud_status = await self.get_photo_status(
+                            apple_id=apple_id,
+                            password=apple_password,
+                            force_fresh_login=False
+                        )
+                else:
+                    # Not on the right page, need to navigate
+                    logger.info("Not on privacy.apple.com, calling get_photo_status...")
+                    icloud_status = await self.get_photo_status(
+                        apple_id=apple_id,
+                        password=apple_password,
+                        force_fresh_login=False
+                    )
+            except Exception as e:
+                logger.warning("Could not reuse session: %s", e)
+                icloud_status = await self.get_photo_status(
+                    apple_id=apple_id,
+                    password=apple_password,
+                    force_fresh_login=not reuse_session
+                )
+        else:
+            logger.info("No existing browser session, getting iCloud photo status...")
+            icloud_status = await self.get_photo_status(
+                apple_id=apple_id,
+                password=apple_password,
+                force_fresh_login=not reuse_session
+            )
+        
+        return icloud_status
+    
     async def _establish_baseline_in_new_context(self) -> Dict[str, Any]:
         """Establish Google One storage baseline in a NEW browser context
         This prevents breaking the transfer workflow on the main page
+        The context lives on the shared browser, so no extra Chromium is launched
         Uses Google One storage metrics instead of Dashboard for accurate tracking
         """
         try:
             from .google_storage_client import GoogleStorageClient
             
-            logger.info("Opening separate browser for Google One storage baseline...")
+            logger.info("Opening separate browser context for Google One storage baseline...")
             
             # Get Google credentials from environment
             google_email = os.getenv('GOOGLE_EMAIL')
             google_password = os.getenv('GOOGLE_PASSWORD')
             
-            # Create a temporary Google Storage client
-            storage_client = GoogleStorageClient()
+            # Create a temporary Google Storage client on the shared browser
+            storage_client = GoogleStorageClient(browser_factory=self._get_browser)
             
             try:
                 # Get storage metrics
@@ -1361,7 +1443,7 @@ class ICloudClientWithSession:
                 logger.info("Closed storage baseline browser context")
                 
         except Exception as e:
-            logger.error(f"Storage baseline establishment failed: {e}")
+            logger.error("Storage baseline establishment failed: %s", e)
             # Return minimal baseline to continue
             return {
                 "status": "success", 
@@ -1402,7 +1484,7 @@ class ICloudClientWithSession:
                     "message": "Failed to establish baseline"
                 }
         except Exception as e:
-            logger.error(f"Baseline establishment failed: {e}")
+            logger.error("Baseline establishment failed: %s", e)
             return {
                 "status": "error",
                 "message": str(e)
@@ -1441,11 +1523,14 @@ class ICloudClientWithSession:
             # Use the complete workflow handler
             workflow = TransferWorkflow(self.page, self.context)
             result = await workflow.execute_complete_workflow(google_email, google_password, confirm_transfer)
-            
+
+            # Keep the confirmation page for confirm_transfer_final_step
+            self.page = workflow.page
+
             return result
             
         except Exception as e:
-            logger.error(f"Transfer initiation failed: {e}")
+            logger.error("Transfer initiation failed: %s", e)
             return {
                 "status": "error",
                 "message": str(e)
@@ -1497,7 +1582,7 @@ class ICloudClientWithSession:
                 else:
                     logger.warning("No select dropdown found on page")
             except Exception as e:
-                logger.error(f"Failed to select Google Photos: {e}")
+                logger.error("Failed to select Google Photos: %s", e)
                 # Try to continue anyway - might already be selected
                 pass
             
@@ -1718,7 +1803,7 @@ class ICloudClientWithSession:
             }
             
         except Exception as e:
-            logger.error(f"Transfer initiation failed: {e}")
+            logger.error("Transfer initiation failed: %s", e)
             return {
                 "status": "error",
                 "message": str(e)
@@ -1747,7 +1832,7 @@ class ICloudClientWithSession:
                 
                 logger.info(f"Transfer {transfer_id} saved to database with migration {migration_id}")
             except Exception as e:
-                logger.error(f"Failed to save transfer to database: {e}")
+                logger.error("Failed to save transfer to database: %s", e)
                 # Fall back to local storage
                 transfers = {}
                 if self.local_transfers_file.exists():
@@ -1768,6 +1853,87 @@ class ICloudClientWithSession:
             with open(self.local_transfers_file, 'w') as f:
                 json.dump(transfers, f, indent=2)
     
+    def _save_progress_snapshot(self, migration_id: str, day_number: int,
+                                storage_result: Dict[str, Any],
+                                progress_result: Dict[str, Any]) -> bool:
+        """Persist a storage snapshot and daily progress row (runs in a worker thread).
+        
+        Returns True once both rows are committed, False if the write failed.
+        """
+        current_google_photos_gb = storage_result.get('google_photos_gb', 0)
+        storage_info = progress_result.get('storage', {})
+        estimates = progress_result.get('estimates', {})
+        progress_info = progress_result.get('progress', {})
+        
+        try:
+            with self.db.get_connection() as conn:
+                # Both rows go in one transaction: a single commit instead of one per
+                # INSERT (a failure rolls back both when the connection closes)
+                conn.begin()
+                
+                # Save snapshot (allows multiple snapshots per day for tracking)
+                conn.execute("""
+                    INSERT INTO storage_snapshots (
+                        migration_id, day_number, snapshot_time,
+                        google_photos_gb, google_drive_gb, gmail_gb,
+                        device_backup_gb, total_used_gb,
+                        storage_growth_gb, estimated_photos_transferred, estimated_videos_transferred,
+                        percent_complete
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    migration_id, day_number, datetime.now(),
+                    current_google_photos_gb,
+                    storage_result.get('google_drive_gb', 0),
+                    storage_result.get('gmail_gb', 0),
+                    storage_result.get('device_backup_gb', 0),
+                    storage_result.get('used_storage_gb', 0),
+                    storage_info.get('growth_gb', 0),
+                    estimates.get('photos_transferred', 0),
+                    estimates.get('videos_transferred', 0),
+                    progress_info.get('percent_complete', 0)
+                ))
+                
+                # Get current family adoption counts before inserting daily progress
+                family_stats = conn.execute("""
+                    SELECT 
+                        COUNT(DISTINCT CASE WHEN faa.app_name = 'WhatsApp' AND faa.whatsapp_in_group = TRUE THEN fm.id END) as whatsapp_connected,
+                        COUNT(DISTINCT CASE WHEN faa.app_name = 'Google Maps' AND faa.location_sharing_received = TRUE THEN fm.id END) as maps_sharing,
+                        COUNT(DISTINCT CASE WHEN faa.app_name = 'Venmo' AND faa.status = 'configured' THEN fm.id END) as venmo_active
+                    FROM family_members fm
+                    LEFT JOIN family_app_adoption faa ON fm.id = faa.family_member_id
+                    WHERE fm.migration_id = ?
+                """, (migration_id,)).fetchone()
+                
+                whatsapp_count = family_stats[0] if family_stats else 0
+                maps_count = family_stats[1] if family_stats else 0
+                venmo_count = family_stats[2] if family_stats else 0
+                
+                # Insert daily progress with family counts (allows multiple updates per day)
+                conn.execute("""
+                    INSERT INTO daily_progress (
+                        migration_id, day_number, date,
+                        photos_transferred, videos_transferred,
+                        size_transferred_gb, storage_percent_complete,
+                        whatsapp_members_connected, maps_members_sharing,
+                        venmo_members_active, key_milestone
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    migration_id, day_number, datetime.now().date(),
+                    estimates.get('photos_transferred', 0),
+                    estimates.get('videos_transferred', 0),
+                    storage_info.get('growth_gb', 0),
+                    progress_info.get('percent_complete', 0),
+                    whatsapp_count, maps_count, venmo_count,
+                    progress_result.get('message', '')
+                ))
+                conn.commit()
+                
+                logger.info(f"Saved snapshot and progress for day {day_number}")
+            return True
+        except Exception as e:
+            logger.warning("Could not save to database: %s", e)
+            return False
+    
     async def _get_transfer(self, transfer_id: str) -> Optional[Dict[str, Any]]:
         """Get transfer data from database or local storage"""
         if self.db:
@@ -1803,7 +1969,7 @@ class ICloudClientWithSession:
                             'destination_account': os.getenv('GOOGLE_EMAIL', 'unknown')
                         }
             except Exception as e:
-                logger.error(f"Failed to get transfer from database: {e}")
+                logger.error("Failed to get transfer from database: %s", e)
             return None
         else:
             if self.local_transfers_file.exists():
@@ -1829,7 +1995,7 @@ class ICloudClientWithSession:
                     )
                     logger.info(f"Progress updated for transfer {transfer_id}")
             except Exception as e:
-                logger.error(f"Failed to update progress in database: {e}")
+                logger.error("Failed to update progress in database: %s", e)
         else:
             # Local storage fallback
             transfer = await self._get_transfer(transfer_id)
@@ -1860,7 +2026,7 @@ class ICloudClientWithSession:
                     
                     logger.info(f"Transfer {transfer_id} marked as complete")
             except Exception as e:
-                logger.error(f"Failed to mark transfer complete in database: {e}")
+                logger.error("Failed to mark transfer complete in database: %s", e)
         else:
             # Local storage fallback
             transfer = await self._get_transfer(transfer_id)
@@ -1882,6 +2048,10 @@ class ICloudClientWithSession:
     
     async def cleanup(self):
         """Clean up resources"""
+        # The storage client runs its own Playwright instance
+        if self.google_storage_client:
+            await self.google_storage_client.cleanup()
+        
         # Check if we're in demo mode
         if os.getenv("DEMO_MODE", "").lower() == "true":
             logger.info("Demo mode: keeping browser open")
@@ -1893,6 +2063,10 @@ class ICloudClientWithSession:
             # Normal cleanup
             if self.browser:
                 await self.browser.close()
+            # A browser we launched dies with it, so its endpoint is stale
+            if self._owns_browser and CDP_PORT:
+                self.cdp_file.unlink(missing_ok=True)
         
         if self.playwright:
-            await self.playwright.stop()
\ No newline at end of file
+            await release_playwright()
+            self.playwright = None
\ No newline at end of file
@@ -17,14 +17,38 @@ Workflow Overview:
 This module is used internally by ICloudClient.start_transfer().
 """
 import os
+import re
 import logging
 import asyncio
 from datetime import datetime
 from typing import Dict, Any, Optional
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Selectors for the final "Confirm Transfers" button, tried in order
+CONFIRM_BUTTON_SELECTORS = (
+    'button:has-text("Confirm Transfers")',
+    'button:has-text("Confirm Transfer")',  # Singular form
+    'button >> text="Confirm Transfers"',
+    'button >> text="Confirm Transfer"',
+    '//button[contains(text(), "Confirm Transfer")]',
+    'button[class*="button"]:has-text("Confirm")',
+    'button[type="submit"]:has-text("Confirm")',
+    'button:text-matches("Confirm.*Transfer")',  # Regex match
+)
+CONFIRM_TRANSFER_BUTTON = 'button:has-text("Confirm Transfer")'
+
+# Text patterns on the confirmation page, compiled once
+_PHOTO_RE = re.compile(r'\d+[,\d]*\s+photos')
+_ACCOUNT_RE = re.compile(r'Transfer to account:.*@')
+_STORAGE_WARNING_RE = re.compile(r'storage available')
+_SUCCESS_RE = re.compile(r'transfer.*complete|started|initiated', re.I)
+
+# Best-effort probes (elements that may never appear) are bounded with
+# asyncio.wait_for rather than Playwright's timeout, whose TimeoutError path
+# is comparatively expensive when misses are the common case
+PROBE_TIMEOUT_SECONDS = 5.0
+
 class TransferWorkflow:
     """Orchestrates the iCloud to Google Photos transfer workflow.
     
@@ -56,12 +80,15 @@ class TransferWorkflow:
         page: Main Playwright page object
         context: Browser context for handling popups
         popup_page: Reference to OAuth popup window
+        apple_page: The privacy.apple.com tab the workflow started on, which
+            becomes the confirmation page once the OAuth popup closes
     """
     
     def __init__(self, page, context):
         self.page = page
         self.context = context
         self.popup_page = None
+        self.apple_page = page
         
     async def execute_complete_workflow(self, google_email: str = None, google_password: str = None, confirm_transfer: bool = False) -> Dict[str, Any]:
         """Execute the complete 8-step transfer initiation workflow.
@@ -164,22 +191,11 @@ class TransferWorkflow:
             if confirm_transfer:
                 logger.info("🚀 Looking for 'Confirm Transfers' button to initiate actual transfer...")
                 try:
-                    # Use the same button selectors as in _wait_for_confirmation_page
-                    button_selectors = [
-                        'button:has-text("Confirm Transfers")',
-                        'button:has-text("Confirm Transfer")',  # Singular form
-                        'button >> text="Confirm Transfers"',
-                        'button >> text="Confirm Transfer"',
-                        '//button[contains(text(), "Confirm Transfer")]',
-                        'button[class*="button"]:has-text("Confirm")',
-                        'button:text-matches("Confirm.*Transfer")',
-                    ]
-                    
                     button_ready = False
                     button = None
                     
                     # First, try to find the button with any selector
-                    for selector in button_selectors:
+                    for selector in CONFIRM_BUTTON_SELECTORS:
                         try:
                             button = await self.page.query_selector(selector)
                             if button:
@@ -221,7 +237,7 @@ class TransferWorkflow:
                     
                     # Now try to click the button with multiple strategies
                     clicked = False
-                    for selector in button_selectors:
+                    for selector in CONFIRM_BUTTON_SELECTORS:
                         try:
                             logger.info(f"Attempting to click with selector: {selector}")
                             await self.page.click(selector, timeout=3000)
@@ -644,34 +660,23 @@ class TransferWorkflow:
                         logger.info("✅ Popup closed, returned to main window")
                         self.popup_page = None
                         break
-                        
-                # Check if we're back on main page with confirmation
-                if len(self.context.pages) > 0:
-                    # IMPORTANT: Find the correct main page (not the popup)
-                    for page in self.context.pages:
-                        try:
-                            page_url = page.url
-                            if 'privacy.apple.com' in page_url and page != self.popup_page:
-                                self.page = page
-                                logger.info(f"✅ Found main Apple page: {page_url[:80]}...")
-                                break
-                        except:
-                            continue
             
-            # Ensure we're on the main page - get the correct page reference
-            if len(self.context.pages) > 0:
+            # The confirmation page renders in the Apple tab we started on, so use
+            # it directly and only scan the context's pages if that tab is gone
+            pages = self.context.pages
+            if self.apple_page and not self.apple_page.is_closed() and 'privacy.apple.com' in self.apple_page.url:
+                self.page = self.apple_page
+                logger.info(f"✅ Using main Apple page: {self.page.url[:80]}...")
+            else:
                 # Find the privacy.apple.com page specifically
-                for page in self.context.pages:
-                    try:
-                        if 'privacy.apple.com' in page.url:
-                            self.page = page
-                            logger.info(f"Setting active page to: {page.url[:80]}...")
-                            break
-                    except:
-                        continue
-                        
+                target = next((page for page in pages if 'privacy.apple.com' in page.url), None)
+                if target:
+                    self.page = target
+                    logger.info(f"Setting active page to: {target.url[:80]}...")
+            
+            if pages:
                 logger.info(f"Current page URL: {self.page.url[:80]}...")
-                
+
                 # CRITICAL: After OAuth, Apple shows a spinner for 20-30 seconds
                 # We need to wait for the final confirmation page to fully load
                 logger.info("⏳ Waiting for Apple's processing spinner to complete (this takes 20-30 seconds)...")
@@ -725,24 +730,14 @@ class TransferWorkflow:
                 logger.info("Looking for 'Confirm Transfers' button...")
                 
                 # Method 1: Try multiple selectors for the button
-                button_selectors = [
-                    'button:has-text("Confirm Transfers")',
-                    'button:has-text("Confirm Transfer")',  # Singular form
-                    'button >> text="Confirm Transfers"',
-                    'button >> text="Confirm Transfer"',
-                    '//button[contains(text(), "Confirm Transfer")]',
-                    'button[class*="button"]:has-text("Confirm")',
-                    'button[type="submit"]:has-text("Confirm")',
-                    'button:text-matches("Confirm.*Transfer")',  # Regex match
-                ]
-                
                 confirm_button = None
-                for selector in button_selectors:
+                button_visible = False
+                for selector in CONFIRM_BUTTON_SELECTORS:
                     try:
                         logger.info(f"Trying selector: {selector}")
-                        confirm_button = await self.page.wait_for_selector(
-                            selector,
-                            timeout=5000  # 5 seconds per selector
+                        confirm_button = await asyncio.wait_for(
+                            self.page.wait_for_selector(selector, timeout=0),
+                            timeout=PROBE_TIMEOUT_SECONDS  # 5 seconds per selector
                         )
                         
                         if confirm_button:
@@ -752,6 +747,7 @@ class TransferWorkflow:
                             
                             if is_visible:
                                 logger.info("✅ Confirmation page loaded - 'Confirm Transfers' button found!")
+                                button_visible = True
                                 break
                     except Exception as e:
                         logger.debug(f"Selector {selector} failed: {e}")
@@ -797,8 +793,9 @@ class TransferWorkflow:
                     await self.page.screenshot(path=confirm_screenshot, full_page=True)
                     logger.info(f"Full page screenshot saved: {confirm_screenshot}")
                 
-                # Give the page a moment to fully stabilize
-                await self.page.wait_for_timeout(2000)
+                # Give the page a moment to fully stabilize (not needed once the button is visible)
+                if not button_visible:
+                    await self.page.wait_for_timeout(2000)
                 
                 logger.info("Confirmation page loading complete")
                     
@@ -807,32 +804,36 @@ class TransferWorkflow:
             # Don't raise, let the workflow continue and handle the error later
     
     async def _extract_confirmation_details(self):
-        """Extract details from the confirmation page"""
+        """Extract details from the confirmation page
+        
+        Reads the rendered page text once and matches every field locally,
+        instead of one selector lookup plus inner_text() round trip per field.
+        """
         try:
             details = {}
+            lines = [line.strip() for line in (await self.page.inner_text('body')).splitlines()]
+            
+            def first_line(pattern):
+                return next((line for line in lines if pattern.search(line)), None)
             
             # Look for photo count
-            photo_text = await self.page.query_selector('text=/\\d+[,\\d]*\\s+photos/')
+            photo_text = first_line(_PHOTO_RE)
             if photo_text:
-                text = await photo_text.inner_text()
-                details['photos'] = text.strip()
+                details['photos'] = photo_text
             
             # Look for destination
-            destination = await self.page.query_selector('text="Google Photos"')
-            if destination:
+            if 'Google Photos' in lines:
                 details['destination'] = 'Google Photos'
             
             # Look for account
-            account_text = await self.page.query_selector('text=/Transfer to account:.*@/')
+            account_text = first_line(_ACCOUNT_RE)
             if account_text:
-                text = await account_text.inner_text()
-                details['account'] = text.replace('Transfer to account:', '').strip()
+                details['account'] = account_text.replace('Transfer to account:', '').strip()
             
             # Look for storage warning
-            warning = await self.page.query_selector('text=/storage available/')
+            warning = first_line(_STORAGE_WARNING_RE)
             if warning:
-                text = await warning.inner_text()
-                details['storage_warning'] = text.strip()
+                details['storage_warning'] = warning
             
             return details
             
@@ -846,16 +847,19 @@ class TransferWorkflow:
             logger.info("🚨 CONFIRMING TRANSFER - This will initiate the actual transfer!")
             
             # Find and click the Confirm Transfer button
-            confirm_btn = await self.page.wait_for_selector('button:has-text("Confirm Transfer")', timeout=10000)
+            confirm_btn = await self.page.wait_for_selector(CONFIRM_TRANSFER_BUTTON, timeout=10000)
             await confirm_btn.click()
             logger.info("✅ Clicked 'Confirm Transfer' button")
             
-            # Wait for confirmation
-            await self.page.wait_for_timeout(3000)
+            # Wait for success message or next page
+            success_msg = self.page.get_by_text(_SUCCESS_RE).first
+            try:
+                await asyncio.wait_for(success_msg.wait_for(timeout=0), timeout=PROBE_TIMEOUT_SECONDS)
+                found = True
+            except asyncio.TimeoutError:
+                found = False
             
-            # Check for success message or next page
-            success_msg = await self.page.query_selector('text=/transfer.*complete|started|initiated/i')
-            if success_msg:
+            if found:
                 msg_text = await success_msg.inner_text()
                 logger.info(f"✅ Transfer confirmed: {msg_text}")
                 return {"status": "confirmed", "message": msg_text}
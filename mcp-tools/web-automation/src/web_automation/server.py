@@ -18,31 +18,164 @@ All operations maintain browser session state across the 7-day migration timelin
 """
 
 import asyncio
-import logging
+import functools
+import hashlib
+import io
 import os
-from typing import Any, Dict
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 from mcp.server import Server
 import mcp.server.stdio
 import mcp.types as types
+import anyio
 
 from .icloud_client import ICloudClientWithSession
 from .logging_config import setup_logging
 
-# Initialize environment and logging
-root_dir = Path(__file__).parent.parent.parent.parent
-load_dotenv(root_dir / '.env')
+# orjson serializes JSON responses faster when installed; stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+# Use uvloop's faster event loop when it is installed (not available on Windows)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Initialize environment and logging (load_dotenv never overrides variables
+# the launching process already set, so .env only fills in the rest)
+_ENV_FILE = Path(__file__).resolve().parents[3] / '.env'
+if _ENV_FILE.is_file():
+    load_dotenv(_ENV_FILE)
 logger = setup_logging(__name__)
 
+@dataclass(frozen=True, slots=True)
+class _Settings:
+    """Configuration resolved once at import (after .env is loaded)."""
+    apple_id: Optional[str]
+    apple_password: Optional[str] = field(repr=False)
+    session_dir: str
+
+_settings = _Settings(
+    apple_id=os.environ.get("APPLE_ID"),
+    apple_password=os.environ.get("APPLE_PASSWORD"),
+    session_dir=os.path.expanduser(os.environ.get("ICLOUD_SESSION_DIR", "~/.icloud_session"))
+)
+
 # Global server instance
 server = Server("web-automation")
 icloud_client = None
+_warmup_task = None
+_init_lock = asyncio.Lock()
+_init_done = asyncio.Event()
+_apis_done = asyncio.Event()
+
+# check_icloud_status results are cached briefly: counts drift slowly and the
+# agent often re-queries within seconds. Set ICLOUD_STATUS_CACHE=false to debug.
+STATUS_TTL = int(os.getenv("ICLOUD_STATUS_TTL", "60"))
+STATUS_CACHE_ENABLED = os.getenv("ICLOUD_STATUS_CACHE", "true").lower() == "true"
+_status_cache: dict[str, tuple[float, dict]] = {}
+
+# stdio transport buffer: large enough that a status or verification response
+# goes out in a single write() instead of several 8 KiB chunks
+STDIO_BUFFER_SIZE = 1 << 16
+
+# WEB_AUTOMATION_FORMAT=json returns the client's result dict as compact JSON
+# instead of the emoji text report (for agents that parse the fields themselves)
+JSON_RESPONSES = os.getenv("WEB_AUTOMATION_FORMAT", "text").lower() == "json"
 
 # ============================================================================
 # PUBLIC MCP TOOLS - Exposed to iOS2Android Agent
 # ============================================================================
 
+# Tool definitions are static, so build them once at import rather than per list_tools call
+_TOOLS = [
+    types.Tool(
+        name="check_icloud_status",
+        description=(
+            "Retrieve iCloud photo library statistics before migration. Authenticates via "
+            "privacy.apple.com, extracts photo/video counts and storage usage, checks for "
+            "existing transfer history. Uses persistent browser sessions to avoid repeated 2FA. "
+            "Essential first step - call before initialize_migration to get actual counts."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "reuse_session": {
+                    "type": "boolean",
+                    "description": "Use saved browser session to skip 2FA (default: true)",
+                    "default": True
+                }
+            },
+            "required": []
+        }
+    ),
+    
+    types.Tool(
+        name="start_photo_transfer",
+        description=(
+            "Initiate Apple's official iCloud to Google Photos transfer service. Establishes "
+            "Google Photos storage baseline, navigates complete privacy.apple.com workflow, "
+            "handles OAuth consent, and optionally confirms transfer. Associates transfer "
+            "with the migration for tracking. Photos visible Day 3-4, complete Day 7."
+        ),
+        inputSchema={
+            "type": "object", 
+            "properties": {
+                "migration_id": {
+                    "type": "string",
+                    "description": "Migration ID from initialize_migration (required to link transfer to migration)"
+                },
+                "reuse_session": {
+                    "type": "boolean",
+                    "description": "Reuse Apple ID session from check_icloud_status (default: true)",
+                    "default": True
+                },
+                "confirm_transfer": {
+                    "type": "boolean", 
+                    "description": "Actually start transfer by clicking 'Confirm' (default: false for safety)",
+                    "default": False
+                }
+            },
+            "required": ["migration_id"]
+        }
+    ),
+    
+    types.Tool(
+        name="verify_photo_transfer_complete", 
+        description=(
+            "Comprehensive transfer completion verification with certificate generation. "
+            "Performs final Google One storage check, compares against iCloud source counts, "
+            "calculates match rates, and generates completion certificate with grade. "
+            "Optionally verifies specific important photos. Use on Day 7 for final validation."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "transfer_id": {
+                    "type": "string",
+                    "description": "Transfer ID to verify"
+                },
+                "important_photos": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional list of specific photo filenames to verify"
+                }
+            },
+            "required": ["transfer_id"]
+        }
+    )
+]
+
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """
@@ -51,86 +184,10 @@ async def handle_list_tools() -> list[types.Tool]:
     These 4 tools form the complete photo migration workflow, designed for optimal
     agent orchestration following the DAY 1 → DAYS 3-7 → DAY 7 pattern.
     """
-    return [
-        types.Tool(
-            name="check_icloud_status",
-            description=(
-                "Retrieve iCloud photo library statistics before migration. Authenticates via "
-                "privacy.apple.com, extracts photo/video counts and storage usage, checks for "
-                "existing transfer history. Uses persistent browser sessions to avoid repeated 2FA. "
-                "Essential first step - call before initialize_migration to get actual counts."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "reuse_session": {
-                        "type": "boolean",
-                        "description": "Use saved browser session to skip 2FA (default: true)",
-                        "default": True
-                    }
-                },
-                "required": []
-            }
-        ),
-        
-        types.Tool(
-            name="start_photo_transfer",
-            description=(
-                "Initiate Apple's official iCloud to Google Photos transfer service. Establishes "
-                "Google Photos storage baseline, navigates complete privacy.apple.com workflow, "
-                "handles OAuth consent, and optionally confirms transfer. Associates transfer "
-                "with the migration for tracking. Photos visible Day 3-4, complete Day 7."
-            ),
-            inputSchema={
-                "type": "object", 
-                "properties": {
-                    "migration_id": {
-                        "type": "string",
-                        "description": "Migration ID from initialize_migration (required to link transfer to migration)"
-                    },
-                    "reuse_session": {
-                        "type": "boolean",
-                        "description": "Reuse Apple ID session from check_icloud_status (default: true)",
-                        "default": True
-                    },
-                    "confirm_transfer": {
-                        "type": "boolean", 
-                        "description": "Actually start transfer by clicking 'Confirm' (default: false for safety)",
-                        "default": False
-                    }
-                },
-                "required": ["migration_id"]
-            }
-        ),
-        
-        types.Tool(
-            name="verify_photo_transfer_complete", 
-            description=(
-                "Comprehensive transfer completion verification with certificate generation. "
-                "Performs final Google One storage check, compares against iCloud source counts, "
-                "calculates match rates, and generates completion certificate with grade. "
-                "Optionally verifies specific important photos. Use on Day 7 for final validation."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "transfer_id": {
-                        "type": "string",
-                        "description": "Transfer ID to verify"
-                    },
-                    "important_photos": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Optional list of specific photo filenames to verify"
-                    }
-                },
-                "required": ["transfer_id"]
-            }
-        )
-    ]
+    return _TOOLS
 
 @server.call_tool()
-async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> list[types.TextContent]:
+async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[types.TextContent]:
     """
     Execute MCP tools for the iOS2Android Agent.
     
@@ -144,211 +201,349 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> list[types.T
     Returns:
         Formatted text response with migration status, progress metrics, and next steps
     """
-    global icloud_client
-    
-    if name == "check_icloud_status":
-        return await _handle_check_icloud_status(arguments)
-    elif name == "start_photo_transfer":
-        return await _handle_start_photo_transfer(arguments)
-    elif name == "verify_photo_transfer_complete":
-        return await _handle_verify_complete(arguments)
-    else:
-        return [types.TextContent(type="text", text=f"Unknown tool: {name}")]
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return _text_response(f"Unknown tool: {name}")
+    return await handler(arguments)
 
 # ============================================================================
-# INTERNAL TOOL IMPLEMENTATIONS
+# RESPONSE TEMPLATES - Built once at import, filled per call
 # ============================================================================
 
-async def _handle_check_icloud_status(arguments: Dict[str, Any]) -> list[types.TextContent]:
-    """Check iCloud photo library status and transfer history."""
-    try:
-        await _ensure_client_initialized()
-        
-        # Validate environment credentials
-        apple_id = os.getenv("APPLE_ID") 
-        password = os.getenv("APPLE_PASSWORD")
-        if not apple_id or not password:
-            return [types.TextContent(
-                type="text",
-                text="Error: Please configure APPLE_ID and APPLE_PASSWORD environment variables"
-            )]
-        
-        # Execute iCloud status check
-        reuse_session = arguments.get("reuse_session", True)
-        result = await icloud_client.get_photo_status(
-            apple_id=apple_id,
-            password=password,
-            force_fresh_login=not reuse_session
-        )
-        
-        # Format response for agent
-        response = f"""iCloud Photo Library Status:
-📸 Photos: {result['photos']:,}
-🎬 Videos: {result['videos']:,}
-💾 Storage: {result['storage_gb']:.1f} GB
-📦 Total Items: {result['total_items']:,}
-
-Session: {'Reused saved session (no 2FA)' if result.get('session_used') else 'New session created'}
+_STATUS_EMOJI = {
+    'complete': '✅', 'cancelled': '❌',
+    'failed': '⚠️', 'in_progress': '🔄'
+}
+
+# Display forms for the known status values, exactly as str.title()/str.upper()
+# render them; unknown values fall back to those str methods
+_STATUS_TITLE = {
+    'complete': 'Complete', 'cancelled': 'Cancelled',
+    'failed': 'Failed', 'in_progress': 'In_Progress'
+}
+_STATUS_UPPER = {
+    'complete': 'COMPLETE', 'incomplete': 'INCOMPLETE', 'in_progress': 'IN_PROGRESS'
+}
+
+_STATUS_TEMPLATE = """iCloud Photo Library Status:
+📸 Photos: {photos:,}
+🎬 Videos: {videos:,}
+💾 Storage: {storage_gb:.1f} GB
+📦 Total Items: {total_items:,}
+
+Session: {session}
 
 Transfer History:
 """
-        # Add transfer history
-        if result.get('existing_transfers'):
-            for transfer in result['existing_transfers']:
-                status_emoji = {
-                    'complete': '✅', 'cancelled': '❌', 
-                    'failed': '⚠️', 'in_progress': '🔄'
-                }.get(transfer['status'], '❓')
-                response += f"{status_emoji} {transfer['status'].title()} - {transfer.get('date', 'Unknown')}\n"
-        else:
-            response += "No previous transfer requests found\n"
-        
-        return [types.TextContent(type="text", text=response)]
-        
-    except Exception as e:
-        logger.error(f"iCloud status check failed: {e}")
-        return [types.TextContent(type="text", text=f"Error: {str(e)}")]
 
-async def _handle_start_photo_transfer(arguments: Dict[str, Any]) -> list[types.TextContent]:
-    """Initiate photo transfer with Google Photos baseline establishment."""
-    try:
-        await _ensure_client_initialized(initialize_apis=True)
-        
-        # Get required migration_id
-        migration_id = arguments.get("migration_id")
-        if not migration_id:
-            return [types.TextContent(
-                type="text", 
-                text="Error: migration_id is required. Get it from initialize_migration and pass it to start_photo_transfer."
-            )]
-        
-        # Execute transfer initiation
-        reuse_session = arguments.get("reuse_session", True)
-        confirm_transfer = arguments.get("confirm_transfer", False) 
-        
-        result = await icloud_client.start_transfer(
-            migration_id=migration_id,
-            reuse_session=reuse_session, 
-            confirm_transfer=confirm_transfer
-        )
-        
-        # Format success response
-        if result.get('status') == 'initiated':
-            response = f"""✅ Photo Transfer Initiated Successfully!
+_NO_HISTORY_SUFFIX = "No previous transfer requests found\n"
+
+_TRANSFER_STARTED_TEMPLATE = """✅ Photo Transfer Initiated Successfully!
 
-Transfer ID: {result['transfer_id']}
-Started: {result['started_at']}
+Transfer ID: {transfer_id}
+Started: {started_at}
 
 📱 Source (iCloud):
-• Photos: {result['source_counts']['photos']:,}
-• Videos: {result['source_counts']['videos']:,}
-• Total: {result['source_counts']['total']:,}
-• Size: {result['source_counts']['size_gb']} GB
+• Photos: {source_counts[photos]:,}
+• Videos: {source_counts[videos]:,}
+• Total: {source_counts[total]:,}
+• Size: {source_counts[size_gb]} GB
 
 📊 Baseline Established:
-• Google Photos baseline: {result['baseline_established']['google_photos_baseline_gb']:.2f} GB
-• Total storage: {result['baseline_established']['total_storage_gb']:.0f} GB
-• Available storage: {result['baseline_established']['available_storage_gb']:.2f} GB
-• Baseline captured at: {result['baseline_established']['baseline_timestamp']}
+• Google Photos baseline: {baseline_established[google_photos_baseline_gb]:.2f} GB
+• Total storage: {baseline_established[total_storage_gb]:.0f} GB
+• Available storage: {baseline_established[available_storage_gb]:.2f} GB
+• Baseline captured at: {baseline_established[baseline_timestamp]}
 
-⏱️ Estimated Completion: {result['estimated_completion_days']} days
+⏱️ Estimated Completion: {estimated_completion_days} days
 
 💡 Next Steps:
 1. Apple will process your transfer request
-2. Check progress daily using transfer ID: {result['transfer_id']}
+2. Check progress daily using transfer ID: {transfer_id}
 3. You'll receive an email when complete"""
-        else:
-            response = f"❌ Transfer initiation failed: {result.get('error', result.get('message'))}"
-        
-        return [types.TextContent(type="text", text=response)]
-        
-    except Exception as e:
-        logger.error(f"Transfer initiation failed: {e}")
-        return [types.TextContent(type="text", text=f"Error: {str(e)}")]
 
+_VERIFY_TEMPLATE = """🎉 Transfer Verification Report
 
-async def _handle_verify_complete(arguments: Dict[str, Any]) -> list[types.TextContent]:
-    """Verify transfer completion with certificate generation."""
-    try:
-        await _ensure_client_initialized(initialize_apis=True)
-        
-        # Validate required parameters
-        transfer_id = arguments.get("transfer_id")
-        if not transfer_id:
-            return [types.TextContent(type="text", text="Error: transfer_id is required")]
-        
-        # Execute completion verification
-        important_photos = arguments.get("important_photos")
-        result = await icloud_client.verify_transfer_complete(
-            transfer_id=transfer_id,
-            important_photos=important_photos,
-            include_email_check=False  # Email verification handled by mobile-mcp
-        )
-        
-        if result.get('status') != 'error':
-            response = f"""🎉 Transfer Verification Report
-
-Transfer ID: {result['transfer_id']}
-Status: {result['status'].upper()}
+Transfer ID: {transfer_id}
+Status: {status}
 
 ✅ Verification Results:
-• Source photos: {result['verification'].get('source_photos', 0):,}
-• Source videos: {result['verification'].get('source_videos', 0):,}
-• Estimated photos transferred: {result['verification'].get('estimated_photos', 0):,}
-• Estimated videos transferred: {result['verification'].get('estimated_videos', 0):,}
-• Match rate: {result['verification'].get('match_rate', 0)}%
+• Source photos: {verification[source_photos]:,}
+• Source videos: {verification[source_videos]:,}
+• Estimated photos transferred: {verification[estimated_photos]:,}
+• Estimated videos transferred: {verification[estimated_videos]:,}
+• Match rate: {verification[match_rate]}%
 
 🏆 Completion Certificate:
-• Grade: {result['certificate']['grade']}
-• Score: {result['certificate']['score']}/100
-• {result['certificate']['message']}
+• Grade: {certificate[grade]}
+• Score: {certificate[score]}/100
+• {certificate[message]}
 
-Certified at: {result['certificate']['issued_at']}
+Certified at: {certificate[issued_at]}
 
 Note: Email verification is handled via mobile-mcp Gmail control"""
-            
-            # Add important photos check if provided
-            if important_photos and result.get('important_photos_check'):
-                response += "\n\n📸 Important Photos Check:"
-                for photo in result['important_photos_check']:
-                    response += f"\n• {photo}"
-        else:
-            response = f"❌ Verification failed: {result.get('error')}"
-        
-        return [types.TextContent(type="text", text=response)]
+
+# Constant validation errors, returned as-is instead of rebuilt per request
+_ERR_NO_CREDENTIALS = [types.TextContent(
+    type="text",
+    text="Error: Please configure APPLE_ID and APPLE_PASSWORD environment variables"
+)]
+_ERR_NO_TRANSFER_ID = [types.TextContent(type="text", text="Error: transfer_id is required")]
+_ERR_NO_MIGRATION_ID = [types.TextContent(
+    type="text",
+    text="Error: migration_id is required. Get it from initialize_migration and pass it to start_photo_transfer."
+)]
+
+# Fallbacks for verification fields the client may omit
+_VERIFICATION_DEFAULTS = {
+    'source_photos': 0, 'source_videos': 0,
+    'estimated_photos': 0, 'estimated_videos': 0,
+    'match_rate': 0
+}
+
+# ============================================================================
+# INTERNAL TOOL IMPLEMENTATIONS
+# ============================================================================
+
+def _tool_handler(action: str):
+    """
+    Wrap a tool handler with the shared error handling.
+    
+    Any exception is logged as "<action> failed" and returned to the agent as an
+    "Error: ..." message instead of propagating to the MCP runtime. Handlers call
+    _ensure_client_initialized themselves, after validating their arguments.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(arguments: dict[str, Any]) -> list[types.TextContent]:
+            try:
+                return await handler(arguments)
+            except Exception as e:
+                logger.error("%s failed: %s", action, e)
+                return _text_response(f"Error: {e}")
+        return wrapper
+    return decorator
+
+@_tool_handler("iCloud status check")
+async def _handle_check_icloud_status(arguments: dict[str, Any]) -> list[types.TextContent]:
+    """Check iCloud photo library status and transfer history."""
+    # Validate environment credentials before paying for initialization
+    apple_id = _settings.apple_id
+    password = _settings.apple_password
+    if not apple_id or not password:
+        return _ERR_NO_CREDENTIALS
+    
+    await _ensure_client_initialized()
+    
+    # Execute iCloud status check (served from cache when fresh)
+    reuse_session = arguments.get("reuse_session", True)
+    key = _status_cache_key(apple_id)
+    cached = _status_cache.get(key) if STATUS_CACHE_ENABLED and reuse_session else None
+    if cached and time.monotonic() - cached[0] < STATUS_TTL:
+        result = cached[1]
+    else:
+        result = await icloud_client.get_photo_status(
+            apple_id=apple_id,
+            password=password,
+            force_fresh_login=not reuse_session
+        )
+        if STATUS_CACHE_ENABLED and result.get('status') == 'success':
+            _status_cache[key] = (time.monotonic(), result)
+    
+    if JSON_RESPONSES:
+        return _json_response(result)
+    
+    # Format response for agent: header followed by one line per transfer
+    header = _STATUS_TEMPLATE.format_map({
+        **result,
+        'session': 'Reused saved session (no 2FA)' if result.get('session_used') else 'New session created'
+    })
+    
+    # First-time users have no history: skip building the per-transfer lines
+    transfers = result.get('existing_transfers')
+    if not transfers:
+        return _text_response(header + _NO_HISTORY_SUFFIX)
+    
+    # Add transfer history
+    return _text_response(header + "".join(
+        f"{_STATUS_EMOJI.get(transfer['status'], '❓')} {_STATUS_TITLE.get(transfer['status']) or transfer['status'].title()} - {transfer.get('date', 'Unknown')}\n"
+        for transfer in transfers
+    ))
+
+@_tool_handler("Transfer initiation")
+async def _handle_start_photo_transfer(arguments: dict[str, Any]) -> list[types.TextContent]:
+    """Initiate photo transfer with Google Photos baseline establishment."""
+    # Get required migration_id (checked before initialization)
+    migration_id = arguments.get("migration_id")
+    if not migration_id:
+        return _ERR_NO_MIGRATION_ID
+    
+    await _ensure_client_initialized(initialize_apis=True)
+    
+    # Execute transfer initiation
+    reuse_session = arguments.get("reuse_session", True)
+    confirm_transfer = arguments.get("confirm_transfer", False) 
+    
+    result = await icloud_client.start_transfer(
+        migration_id=migration_id,
+        reuse_session=reuse_session, 
+        confirm_transfer=confirm_transfer
+    )
+    
+    if result.get('status') == 'initiated':
+        # Counts are about to change, so drop the cached status
+        _status_cache.pop(_status_cache_key(_settings.apple_id or ""), None)
+    
+    if JSON_RESPONSES:
+        return _json_response(result)
+    
+    # Format success response
+    if result.get('status') == 'initiated':
+        response = _TRANSFER_STARTED_TEMPLATE.format_map(result)
+    else:
+        response = f"❌ Transfer initiation failed: {result.get('error', result.get('message'))}"
+    
+    return _text_response(response)
+
+@_tool_handler("Verification")
+async def _handle_verify_complete(arguments: dict[str, Any]) -> list[types.TextContent]:
+    """Verify transfer completion with certificate generation."""
+    # Validate required parameters (before initialization)
+    transfer_id = arguments.get("transfer_id")
+    if not transfer_id:
+        return _ERR_NO_TRANSFER_ID
+    
+    await _ensure_client_initialized(initialize_apis=True)
+    
+    # Execute completion verification
+    important_photos = arguments.get("important_photos")
+    result = await icloud_client.verify_transfer_complete(
+        transfer_id=transfer_id,
+        important_photos=important_photos,
+        include_email_check=False  # Email verification handled by mobile-mcp
+    )
+    
+    if JSON_RESPONSES:
+        return _json_response(result)
+    
+    if result.get('status') != 'error':
+        # Merge defaults once instead of a .get() per field
+        response = _VERIFY_TEMPLATE.format_map({
+            **result,
+            'status': _STATUS_UPPER.get(result['status']) or result['status'].upper(),
+            'verification': {**_VERIFICATION_DEFAULTS, **(result.get('verification') or {})}
+        })
         
-    except Exception as e:
-        logger.error(f"Verification failed: {e}")
-        return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+        # Add important photos check if provided
+        if important_photos and result.get('important_photos_check'):
+            response += "\n\n📸 Important Photos Check:" + "".join(
+                f"\n• {photo}" for photo in result['important_photos_check']
+            )
+    else:
+        response = f"❌ Verification failed: {result.get('error')}"
+    
+    return _text_response(response)
+
+# Tool name -> implementation, used by handle_call_tool
+_HANDLERS = {
+    "check_icloud_status": _handle_check_icloud_status,
+    "start_photo_transfer": _handle_start_photo_transfer,
+    "verify_photo_transfer_complete": _handle_verify_complete,
+}
 
 # ============================================================================
 # PRIVATE UTILITY FUNCTIONS
 # ============================================================================
 
 async def _ensure_client_initialized(initialize_apis: bool = False):
-    """Ensure iCloud client is initialized with optional API initialization."""
+    """Ensure iCloud client is initialized with optional API initialization.
+    
+    Initialization runs once; concurrent callers (including the startup warmup)
+    wait on the lock and then see the completed state.
+    """
     global icloud_client
     
-    if icloud_client is None:
-        session_dir = os.path.expanduser("~/.icloud_session")
-        icloud_client = ICloudClientWithSession(session_dir=session_dir)
-        await icloud_client.initialize()
+    # Fast path once everything requested is ready - no lock, no awaits
+    if _init_done.is_set() and (_apis_done.is_set() or not initialize_apis):
+        return
     
-    if initialize_apis:
-        await icloud_client.initialize_apis()
+    async with _init_lock:
+        if not _init_done.is_set():
+            icloud_client = ICloudClientWithSession(session_dir=_settings.session_dir)
+            if initialize_apis:
+                # Playwright startup and API/database setup don't depend on each other
+                await asyncio.gather(icloud_client.initialize(), icloud_client.initialize_apis())
+                _apis_done.set()
+            else:
+                await icloud_client.initialize()
+            _init_done.set()
+        
+        if initialize_apis and not _apis_done.is_set():
+            await icloud_client.initialize_apis()
+            _apis_done.set()
+
+def _text_response(text: str) -> list[types.TextContent]:
+    """Wrap server-generated text as a tool result, skipping pydantic validation."""
+    return [types.TextContent.model_construct(type="text", text=text)]
+
+def _json_default(value: Any) -> str:
+    """Encode values JSON can't: datetimes as ISO 8601 (as orjson does), the rest via str."""
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+def _json_response(result: dict) -> list[types.TextContent]:
+    """Serialize a client result as compact JSON."""
+    if ORJSON_AVAILABLE:
+        text = orjson.dumps(result, default=_json_default).decode()
+    else:
+        text = json.dumps(result, separators=(",", ":"), ensure_ascii=False, default=_json_default)
+    return _text_response(text)
+
+def _status_cache_key(apple_id: str) -> str:
+    """Cache key for an Apple ID without keeping the address itself in memory."""
+    return hashlib.sha256(apple_id.encode()).hexdigest()
+
+async def _warm_up():
+    """Initialize the client in the background so the first tool call isn't cold."""
+    try:
+        await _ensure_client_initialized(initialize_apis=True)
+        logger.info("iCloud client warmed up")
+    except Exception as e:
+        logger.warning("Client warmup failed, first tool call will retry: %s", e)
 
 # ============================================================================
 # SERVER RUNTIME AND TEST COMPATIBILITY
 # ============================================================================
 
+def _buffered_stdio():
+    """Open stdin/stdout with larger buffers, leaving the process handles open."""
+    stdin = io.open(sys.stdin.fileno(), "rb", buffering=STDIO_BUFFER_SIZE, closefd=False)
+    stdout = io.open(sys.stdout.fileno(), "wb", buffering=STDIO_BUFFER_SIZE, closefd=False)
+    return (
+        anyio.wrap_file(io.TextIOWrapper(stdin, encoding="utf-8", errors="replace")),
+        anyio.wrap_file(io.TextIOWrapper(stdout, encoding="utf-8"))
+    )
+
 async def main():
     """Main MCP server runtime."""
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    global _warmup_task
+    
+    # Start warming the client before the transport so browser launch overlaps
+    # the MCP handshake; tool calls still wait on _ensure_client_initialized
+    _warmup_task = asyncio.create_task(_warm_up())
+    
+    stdin, stdout = _buffered_stdio()
+    async with mcp.server.stdio.stdio_server(stdin=stdin, stdout=stdout) as (read_stream, write_stream):
+        try:
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+        finally:
+            # One browser serves every tool call; release it when the session ends
+            _warmup_task.cancel()
+            if icloud_client:
+                await icloud_client.cleanup()
 
 # Test compatibility exports
 async def initialize_server():
@@ -357,12 +552,15 @@ async def initialize_server():
     return icloud_client
 
 async def get_tools():
-    """Get tools list for testing."""
-    return await handle_list_tools()
+    """Get tools list for testing (the same prebuilt list list_tools serves)."""
+    return _TOOLS
 
-async def call_tool(name: str, arguments: Dict[str, Any]) -> list[types.TextContent]:
+async def call_tool(name: str, arguments: dict[str, Any]) -> list[types.TextContent]:
     """Direct tool execution for testing."""
     return await handle_call_tool(name, arguments)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
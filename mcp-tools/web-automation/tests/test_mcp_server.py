@@ -43,6 +43,7 @@ through the proper MCP protocol interface, not direct function calls.
 import asyncio
 import json
 import os
+import re
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -52,6 +53,13 @@ from typing import Dict, Any
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / 'shared' / 'database'))
 from migration_db import get_migration_db
 
+# Transfer ID as printed by start_photo_transfer
+_TRANSFER_ID_RE = re.compile(r'Transfer ID: (TRF-\d+-\d+)')
+
+async def _ainput(prompt: str) -> str:
+    """Read a line from the user without blocking the event loop"""
+    return (await asyncio.to_thread(input, prompt)).strip()
+
 # Simulate MCP client interactions
 class MCPServerTester:
     """Test MCP server with simulated tool calls"""
@@ -164,7 +172,7 @@ class MCPServerTester:
         print(f"Using test migration_id: {migration_id}")
         
         # Ask if user wants to actually confirm the transfer
-        confirm = input("\nActually initiate transfer with Apple? (y/n, default=n): ").strip().lower()
+        confirm = (await _ainput("\nActually initiate transfer with Apple? (y/n, default=n): ")).lower()
         args = {
             "migration_id": migration_id,
             "reuse_session": True,
@@ -186,8 +194,7 @@ class MCPServerTester:
                 print(content)
                 
                 # Extract transfer ID from the formatted text if present
-                import re
-                transfer_id_match = re.search(r'Transfer ID: (TRF-\d+-\d+)', content)
+                transfer_id_match = _TRANSFER_ID_RE.search(content)
                 if transfer_id_match:
                     transfer_id = transfer_id_match.group(1)
                     print(f"\nExtracted Transfer ID: {transfer_id}")
@@ -264,7 +271,7 @@ class MCPServerTester:
         print("="*60)
         
         # First, we need a transfer ID - either get existing or create test one
-        transfer_id = input("\nEnter transfer ID (or press Enter for test ID): ").strip()
+        transfer_id = await _ainput("\nEnter transfer ID (or press Enter for test ID): ")
         if not transfer_id:
             transfer_id = f"TRF-TEST-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
             print(f"Using test ID: {transfer_id}")
@@ -392,37 +399,30 @@ class MCPServerTester:
         
         # 1. Check status
         await self.test_check_status()
-        await asyncio.sleep(1)
         
         # 2. Start transfer (simulated - won't actually start)
-        confirm = input("\nStart transfer test? (y/n): ").strip().lower()
+        confirm = (await _ainput("\nStart transfer test? (y/n): ")).lower()
         if confirm == 'y':
             transfer_id = await self.test_start_transfer()
             
             if transfer_id:
-                await asyncio.sleep(1)
-                
                 # 3. Check progress with different days
                 print("\n📊 Testing storage-based progress tracking...")
                 
                 # Day 1 - Just started
                 print("\n--- Testing Day 1 Progress ---")
                 await self.test_check_progress(transfer_id, 1)
-                await asyncio.sleep(1)
                 
                 # Day 4 - Photos appearing
                 print("\n--- Testing Day 4 Progress ---")
                 await self.test_check_progress(transfer_id, 4)
-                await asyncio.sleep(1)
                 
                 # Day 7 - Nearly complete
                 print("\n--- Testing Day 7 Progress ---")
                 await self.test_check_progress(transfer_id, 7)
-                await asyncio.sleep(1)
                 
                 # 4. Verify complete
                 await self.test_verify_complete(transfer_id)
-                await asyncio.sleep(1)
                 
                 # 5. Check email
                 await self.test_check_email(transfer_id)
@@ -453,7 +453,7 @@ class MCPServerTester:
             if transfer_id:
                 print(f"Current transfer ID: {transfer_id}")
             
-            choice = input("\nSelect option (0-8): ").strip()
+            choice = await _ainput("\nSelect option (0-8): ")
             
             if choice == '1':
                 await self.list_tools()
@@ -466,7 +466,7 @@ class MCPServerTester:
             elif choice == '4':
                 # Test current day progress
                 if not transfer_id:
-                    transfer_id = input("Enter transfer ID (or press Enter for test): ").strip()
+                    transfer_id = await _ainput("Enter transfer ID (or press Enter for test): ")
                     if not transfer_id:
                         # Create a test transfer
                         transfer_id = f"TRF-TEST-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
@@ -482,7 +482,7 @@ class MCPServerTester:
             elif choice == '5':
                 # Test specific day progress
                 if not transfer_id:
-                    transfer_id = input("Enter transfer ID (or press Enter for test): ").strip()
+                    transfer_id = await _ainput("Enter transfer ID (or press Enter for test): ")
                     if not transfer_id:
                         # Create a test transfer
                         transfer_id = f"TRF-TEST-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
@@ -494,7 +494,7 @@ class MCPServerTester:
                             )
                             print(f"Created test transfer: {transfer_id}")
                 if transfer_id:
-                    day = input("Enter day number (1-7): ").strip()
+                    day = await _ainput("Enter day number (1-7): ")
                     if day.isdigit() and 1 <= int(day) <= 7:
                         await self.test_check_progress(transfer_id, int(day))
                     else:
@@ -504,7 +504,7 @@ class MCPServerTester:
                 await self.test_storage_timeline()
             elif choice == '7':
                 if not transfer_id:
-                    transfer_id = input("Enter transfer ID (or press Enter for test): ").strip()
+                    transfer_id = await _ainput("Enter transfer ID (or press Enter for test): ")
                     if not transfer_id:
                         # Create a test transfer
                         transfer_id = f"TRF-TEST-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
@@ -527,7 +527,7 @@ class MCPServerTester:
                 print("Invalid option")
             
             if choice != '0':
-                input("\nPress Enter to continue...")
+                await _ainput("\nPress Enter to continue...")
 
 async def main():
     """Main test runner"""
@@ -550,7 +550,7 @@ async def main():
             print(f"  - {var}")
         print("\nPlease set these in your .env file")
         
-        confirm = input("\nContinue anyway? (y/n): ").strip().lower()
+        confirm = (await _ainput("\nContinue anyway? (y/n): ")).lower()
         if confirm != 'y':
             return
     
@@ -564,7 +564,7 @@ async def main():
         print("1. Interactive menu")
         print("2. Run full test sequence")
         
-        mode = input("Choice (1-2): ").strip()
+        mode = await _ainput("Choice (1-2): ")
         
         if mode == '2':
             await tester.run_full_test()
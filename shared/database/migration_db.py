@@ -41,6 +41,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Connection settings: row order is never relied on (queries ORDER BY where it
+# matters), and the working set is a handful of small tables
+CONNECTION_CONFIG = {
+    'preserve_insertion_order': False,
+    'memory_limit': os.getenv('MIGRATION_DB_MEMORY_LIMIT', '512MB'),
+    'threads': 2
+}
+
 class MigrationDatabase:
     """
     Centralized database for all migration tools.
@@ -92,7 +100,7 @@ class MigrationDatabase:
             with db.get_connection() as conn:
                 conn.execute("SELECT * FROM migration_status")
         """
-        conn = duckdb.connect(str(self.db_path))
+        conn = duckdb.connect(str(self.db_path), config=CONNECTION_CONFIG)
         try:
             yield conn
         finally:
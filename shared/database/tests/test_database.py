@@ -5,21 +5,14 @@ Validates video support, storage tracking, and all new features
 """
 
 import sys
-import os
 from pathlib import Path
 import duckdb
-from datetime import datetime, timedelta
-import json
-
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 class DatabaseTester:
     def __init__(self):
         self.db_path = Path('~/.ios_android_migration/migration.db').expanduser()
         self.conn = None
-        self.tests_passed = 0
-        self.tests_failed = 0
+        self.results = {}
         
     def connect(self):
         """Connect to the database"""
@@ -39,18 +32,13 @@ class DatabaseTester:
         """Run a test and track results"""
         try:
             print(f"\n🧪 Testing: {name}")
-            result = test_func()
-            if result:
-                print(f"  ✅ PASSED")
-                self.tests_passed += 1
-            else:
-                print(f"  ❌ FAILED")
-                self.tests_failed += 1
-            return result
+            result = bool(test_func())
+            print(f"  ✅ PASSED" if result else f"  ❌ FAILED")
         except Exception as e:
             print(f"  ❌ ERROR: {e}")
-            self.tests_failed += 1
-            return False
+            result = False
+        self.results[name] = result
+        return result
     
     def test_all_tables_exist(self):
         """Test that all 7 tables exist"""
@@ -61,11 +49,11 @@ class DatabaseTester:
         ]
         
         tables = self.conn.execute("""
-            SELECT table_name FROM information_schema.tables 
-            WHERE table_schema = 'main' AND table_type = 'BASE TABLE'
+            SELECT table_name FROM duckdb_tables()
+            WHERE schema_name = 'main'
         """).fetchall()
         
-        actual = [t[0] for t in tables]
+        actual = {t[0] for t in tables}
         missing = [t for t in expected if t not in actual]
         
         if missing:
@@ -78,22 +66,14 @@ class DatabaseTester:
     def test_migration_initialization(self):
         """Test creating a new migration with video and storage support"""
         try:
-            # Create a migration with all new fields
-            self.conn.execute("""
+            # Create a migration with all new fields and read back its ID
+            result = self.conn.execute("""
                 INSERT INTO migration_status 
                 (user_name, years_on_ios, photo_count, video_count, 
                  total_icloud_storage_gb, icloud_photo_storage_gb, icloud_video_storage_gb,
                  google_photos_baseline_gb, family_size)
                 VALUES ('George', 18, 60238, 2418, 383.0, 268.1, 114.9, 13.88, 5)
-            """)
-            
-            # Get the created migration
-            result = self.conn.execute("""
-                SELECT id, user_name, photo_count 
-                FROM migration_status 
-                WHERE user_name = 'George'
-                ORDER BY started_at DESC
-                LIMIT 1
+                RETURNING id, user_name, photo_count
             """).fetchone()
             
             if not result:
@@ -127,12 +107,11 @@ class DatabaseTester:
                 (1004, 'Maya', 'maya.vetticaden@gmail.com', 'child', 11)
             ]
             
-            for id, name, email, role, age in family:
-                self.conn.execute(f"""
-                    INSERT INTO family_members 
-                    (id, migration_id, name, email, role, age)
-                    VALUES ({id}, 'TEST-MIG-001', '{name}', '{email}', '{role}', {age if age else 'NULL'})
-                """)
+            self.conn.executemany("""
+                INSERT INTO family_members 
+                (id, migration_id, name, email, role, age)
+                VALUES (?, 'TEST-MIG-001', ?, ?, ?, ?)
+            """, family)
             
             # Verify
             count = self.conn.execute("""
@@ -177,8 +156,8 @@ class DatabaseTester:
                         'initiated', 'initiated', 'initiated', 4)
             """)
             
-            # Update progress with videos
-            self.conn.execute("""
+            # Update progress with videos and read back both counts
+            result = self.conn.execute("""
                 UPDATE media_transfer 
                 SET transferred_photos = 16369,
                     transferred_videos = 847,
@@ -187,14 +166,8 @@ class DatabaseTester:
                     video_status = 'in_progress',
                     overall_status = 'in_progress'
                 WHERE migration_id = 'TEST-MIG-002'
-            """)
-            
-            # Verify both photos and videos
-            result = self.conn.execute("""
-                SELECT transferred_photos, transferred_videos, 
-                       photo_status, video_status 
-                FROM media_transfer 
-                WHERE migration_id = 'TEST-MIG-002'
+                RETURNING transferred_photos, transferred_videos, 
+                          photo_status, video_status
             """).fetchone()
             
             # Clean up
@@ -225,7 +198,7 @@ class DatabaseTester:
             
             for view in views:
                 # Just check if we can query it without error
-                self.conn.execute(f"SELECT * FROM {view} LIMIT 1").fetchall()
+                self.conn.execute(f"SELECT 1 FROM {view} LIMIT 1").fetchall()
             
             print(f"    All {len(views)} views are accessible")
             return True
@@ -249,27 +222,20 @@ class DatabaseTester:
             """)
             
             # Track app adoption
-            adoption_id = 4001
-            for app in ['WhatsApp', 'Google Maps', 'Venmo']:
-                self.conn.execute(f"""
-                    INSERT INTO family_app_adoption 
-                    (id, family_member_id, app_name, status)
-                    VALUES ({adoption_id}, 9999, '{app}', 'not_started')
-                """)
-                adoption_id += 1
-            
-            # Update WhatsApp to configured
-            self.conn.execute("""
+            apps = ['WhatsApp', 'Google Maps', 'Venmo']
+            self.conn.executemany("""
+                INSERT INTO family_app_adoption 
+                (id, family_member_id, app_name, status)
+                VALUES (?, 9999, ?, 'not_started')
+            """, list(enumerate(apps, start=4001)))
+            
+            # Update WhatsApp to configured and read back its status
+            result = self.conn.execute("""
                 UPDATE family_app_adoption 
                 SET status = 'configured',
                     configured_at = CURRENT_TIMESTAMP
                 WHERE family_member_id = 9999 AND app_name = 'WhatsApp'
-            """)
-            
-            # Verify
-            result = self.conn.execute("""
-                SELECT status FROM family_app_adoption 
-                WHERE family_member_id = 9999 AND app_name = 'WhatsApp'
+                RETURNING status
             """).fetchone()
             
             # Clean up
@@ -302,22 +268,16 @@ class DatabaseTester:
                 VALUES ('TEST-MIG-STORAGE', 'TestUser', 13.88)
             """)
             
-            # Add baseline snapshot
+            # Add baseline and Day 4 progress snapshots
             self.conn.execute("""
                 INSERT INTO storage_snapshots 
                 (migration_id, day_number, google_photos_gb, google_drive_gb, gmail_gb,
-                 total_used_gb, storage_growth_gb, percent_complete, is_baseline)
+                 total_used_gb, storage_growth_gb, percent_complete,
+                 estimated_photos_transferred, estimated_videos_transferred, is_baseline)
                 VALUES ('TEST-MIG-STORAGE', 1, 13.88, 52.52, 33.26, 
-                        99.75, 0.0, 0.0, true)
-            """)
-            
-            # Add Day 4 progress snapshot
-            self.conn.execute("""
-                INSERT INTO storage_snapshots 
-                (migration_id, day_number, google_photos_gb, storage_growth_gb, 
-                 percent_complete, estimated_photos_transferred, estimated_videos_transferred)
-                VALUES ('TEST-MIG-STORAGE', 4, 120.88, 107.0, 
-                        28.0, 16369, 847)
+                        99.75, 0.0, 0.0, NULL, NULL, true),
+                       ('TEST-MIG-STORAGE', 4, 120.88, NULL, NULL,
+                        NULL, 107.0, 28.0, 16369, 847, false)
             """)
             
             # Verify progress
@@ -367,21 +327,15 @@ class DatabaseTester:
                 VALUES (5001, 'TEST-MIG-005', 8888, true)
             """)
             
-            # Simulate card activation
-            self.conn.execute("""
+            # Simulate card activation and read back the card
+            result = self.conn.execute("""
                 UPDATE venmo_setup 
                 SET card_arrived_at = CURRENT_TIMESTAMP,
                     card_activated_at = CURRENT_TIMESTAMP,
                     card_last_four = '1234',
                     setup_complete = true
                 WHERE family_member_id = 8888
-            """)
-            
-            # Verify
-            result = self.conn.execute("""
-                SELECT setup_complete, card_last_four 
-                FROM venmo_setup 
-                WHERE family_member_id = 8888
+                RETURNING setup_complete, card_last_four
             """).fetchone()
             
             # Clean up
@@ -449,7 +403,7 @@ class DatabaseTester:
                 """)
                 print("    ❌ CHECK constraint not working (progress > 100 allowed)")
                 return False
-            except:
+            except duckdb.ConstraintException:
                 print("    ✓ CHECK constraint working (progress > 100 rejected)")
             
             # Test CHECK constraint on phase
@@ -460,7 +414,7 @@ class DatabaseTester:
                 """)
                 print("    ❌ CHECK constraint not working (invalid phase allowed)")
                 return False
-            except:
+            except duckdb.ConstraintException:
                 print("    ✓ CHECK constraint working (invalid phase rejected)")
             
             # Test foreign key constraint (intentionally disabled for DuckDB)
@@ -507,17 +461,22 @@ class DatabaseTester:
         self.test("Constraints enforcement", self.test_constraints)
         
         # Summary
+        passed = sum(self.results.values())
+        failed = len(self.results) - passed
         print("\n" + "=" * 60)
         print(f"📊 Test Results Summary")
-        print(f"   ✅ Passed: {self.tests_passed}")
-        print(f"   ❌ Failed: {self.tests_failed}")
-        print(f"   Total: {self.tests_passed + self.tests_failed}")
+        print(f"   ✅ Passed: {passed}")
+        print(f"   ❌ Failed: {failed}")
+        print(f"   Total: {len(self.results)}")
         
-        if self.tests_failed == 0:
+        if failed == 0:
             print("\n🎉 All tests passed! Database is ready for use.")
             return True
         else:
-            print(f"\n⚠️  {self.tests_failed} test(s) failed. Please review.")
+            print(f"\n⚠️  {failed} test(s) failed. Please review.")
+            for name, result in self.results.items():
+                if not result:
+                    print(f"   - {name}")
             return False
     
     def __del__(self):